@@ -1,5 +1,6 @@
 """Application configuration and settings."""
 import logging
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
@@ -25,6 +26,26 @@ class Settings(BaseSettings):
     # Model Configuration
     TURKISH_MODEL: str = "yeniguno/bert-uncased-turkish-intent-classification"  # Not used - translation layer instead
     ENGLISH_MODEL: str = "philschmid/BERT-Banking77"  # Official Banking77 model - correct repository name
+    TRANSLATION_MODEL: str = "Helsinki-NLP/opus-mt-tr-en"  # Local MarianMT model for the Turkish translation layer
+    TORCH_NUM_THREADS: int = 2  # Intra-op CPU threads per process (concurrency x threads <= cores)
+    USE_FP16: bool = False  # Cast the model to half precision (CUDA only)
+    USE_INT8_QUANTIZATION: bool = False  # Dynamic int8 quantization of Linear layers (CPU only)
+    TRACE_SEQ_LEN: int = 0  # > 0 traces the model at this length for shorter single texts (ignored with torch.compile)
+    USE_TORCH_COMPILE: bool = False  # Compile the model with torch.compile (slow first request)
+    INFERENCE_BATCH_MAX_SIZE: int = 1  # > 1 coalesces concurrent predictions into one forward pass
+    INFERENCE_BATCH_MAX_WAIT_MS: float = 5.0  # How long a batch waits for more requests
+    
+    # PII Guardrail Configuration
+    PII_FAST_ONLY: bool = True  # Regex fast path only - the Presidio analyzer is never loaded
+    PII_CACHE_SIZE: int = 10000  # Memoized anonymize results per process
+    PII_CACHE_MAX_TEXT_LENGTH: int = 1024  # Longer texts bypass the cache (bounds it to ~20 MB)
+    
+    # Ticket batch endpoint
+    TICKET_BATCH_MAX_SIZE: int = 50  # Max texts accepted by POST /tickets/batch
+    
+    # Ticket persistence (Celery worker)
+    TICKET_INSERT_BATCH_SIZE: int = 50  # Buffered tickets per multi-row INSERT (1 = insert immediately)
+    TICKET_INSERT_FLUSH_INTERVAL_MS: int = 250  # Max time a ticket waits in the buffer
     
     # Application Settings
     PROJECT_NAME: str = "SmartSupport Backend API"
@@ -56,21 +77,29 @@ class Settings(BaseSettings):
             self.CELERY_RESULT_BACKEND = f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
 
 
-# Initialize settings - will not crash if environment variables are missing
-try:
-    settings = Settings()
-    logger.info("Settings loaded successfully")
-except Exception as e:
-    logger.error(f"Failed to load settings: {str(e)}")
-    # Create settings with all defaults as fallback
-    settings = Settings(
-        API_KEY="CHANGE_ME_IN_PRODUCTION",
-        REDIS_HOST="redis",
-        REDIS_PORT=6379,
-        REDIS_DB=0
-    )
-    logger.warning("Using fallback default settings")
-
-
-
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the cached application settings.
+    Environment parsing and validation run once per process; later calls reuse the instance.
+    Will not crash if environment variables are missing.
+    
+    Returns:
+        Settings instance
+    """
+    try:
+        loaded_settings = Settings()
+        logger.info("Settings loaded successfully")
+        return loaded_settings
+    except Exception as e:
+        logger.error(f"Failed to load settings: {str(e)}")
+        # Create settings with all defaults as fallback
+        fallback_settings = Settings(
+            API_KEY="CHANGE_ME_IN_PRODUCTION",
+            REDIS_HOST="redis",
+            REDIS_PORT=6379,
+            REDIS_DB=0
+        )
+        logger.warning("Using fallback default settings")
+        return fallback_settings
 
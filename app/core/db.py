@@ -13,36 +13,122 @@ BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DATABASE_PATH = BASE_DIR / "smartsupport.db"
 DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
 
-# Create engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},  # Needed for SQLite - allows multi-threaded access
-    echo=False  # Set to True for SQL query logging
-)
-
-# Enable WAL (Write-Ahead Logging) mode for SQLite
-# This allows concurrent reads/writes and fixes "readonly database" errors
-@event.listens_for(engine, "connect")
+# Schema version stored in PRAGMA user_version - bump when adding a migration to init_db()
+SCHEMA_VERSION = 2
+
+
+# Connection-level SQLite pragmas, applied to every new pooled connection
+# WAL (a database-level, persistent setting) is enabled once in init_db()
 def set_sqlite_pragma(dbapi_connection, connection_record):
-    """Enable WAL mode on SQLite connection to allow concurrent access."""
+    """Apply connection-level performance pragmas on SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, avoids fsync on every commit
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")  # 64 MB page cache
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB memory-mapped I/O
+    cursor.execute("PRAGMA busy_timeout=5000")  # Wait up to 5s on locks instead of failing
+    cursor.close()
+    logger.debug("SQLite connection pragmas applied")
+
+
+def set_sqlite_read_only_pragma(dbapi_connection, connection_record):
+    """Reject any write statement on read engine connections."""
     cursor = dbapi_connection.cursor()
-    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA query_only=1")
     cursor.close()
-    logger.debug("SQLite WAL mode enabled")
+
+
+def create_write_engine(database_path: Path):
+    """
+    Create the read-write engine for a SQLite database file.
+    Single connection so SQLite's writer lock is never contended in-process.
+    
+    Args:
+        database_path: Path of the SQLite database file
+        
+    Returns:
+        SQLAlchemy engine
+    """
+    write_engine = create_engine(
+        f"sqlite:///{database_path}",
+        connect_args={"check_same_thread": False},  # Needed for SQLite - allows multi-threaded access
+        pool_size=1,
+        max_overflow=0,
+        echo=False  # Set to True for SQL query logging
+    )
+    event.listen(write_engine, "connect", set_sqlite_pragma)
+    return write_engine
+
+
+def create_read_engine(database_path: Path):
+    """
+    Create the read-only engine for a SQLite database file (WAL allows concurrent readers).
+    
+    Args:
+        database_path: Path of the SQLite database file
+        
+    Returns:
+        SQLAlchemy engine
+    """
+    # Read-only URI with a shared page cache across read connections (never used for writes)
+    read_engine = create_engine(
+        f"sqlite:///file:{database_path}?mode=ro&cache=shared&uri=true",
+        connect_args={"check_same_thread": False, "uri": True},
+        pool_size=5,
+        echo=False
+    )
+    
+    @event.listens_for(read_engine, "do_connect")
+    def create_missing_database_file(dialect, connection_record, cargs, cparams):
+        # mode=ro cannot create the file ("unable to open database file") when a read
+        # comes before any write - an empty file is a valid, empty SQLite database
+        database_path.touch(exist_ok=True)
+    
+    event.listen(read_engine, "connect", set_sqlite_pragma)
+    event.listen(read_engine, "connect", set_sqlite_read_only_pragma)
+    return read_engine
+
+
+write_engine = create_write_engine(DATABASE_PATH)
+read_engine = create_read_engine(DATABASE_PATH)
+
+# Backward compatibility: default engine is the write engine
+engine = write_engine
 
 # Log database connection
 logger.info(f"Database connected at: {DATABASE_URL}")
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create session factories
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=write_engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
+def enable_wal_mode():
     """
-    Dependency function to get database session.
+    Enable WAL (Write-Ahead Logging) mode once for the database file.
+    WAL allows concurrent reads/writes and fixes "readonly database" errors.
+    journal_mode is persistent, so it is only switched if not already set.
+    """
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        current_mode = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+        if str(current_mode).lower() != "wal":
+            cursor.execute("PRAGMA journal_mode=WAL")
+            logger.info("SQLite WAL mode enabled")
+        else:
+            logger.debug("SQLite WAL mode already enabled")
+        cursor.close()
+    finally:
+        connection.close()
+
+
+def get_write_db():
+    """
+    Dependency function to get a read-write database session.
     Yields a database session and closes it after use.
     """
     db = SessionLocal()
@@ -52,17 +138,43 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """
+    Dependency function to get a read-only database session.
+    Used by query endpoints so they never wait on the single write connection.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Backward compatibility alias
+get_db = get_write_db
+
+
 def init_db():
     """Initialize database by creating all tables and migrating existing ones."""
     from app.models.sql_models import Ticket  # Import to register models
-    from sqlalchemy import text
+    from sqlalchemy import inspect, text
     
-    Base.metadata.create_all(bind=engine)
+    enable_wal_mode()
+    
+    # Skip CREATE TABLE round-trips on every boot once the table exists
+    if not inspect(engine).has_table(Ticket.__tablename__):
+        Base.metadata.create_all(bind=engine)
     
     # Migrate existing tables: Add new columns if they don't exist
     # This handles existing databases that were created before columns were added
     try:
         with engine.begin() as conn:  # begin() handles transaction automatically
+            # PRAGMA user_version records the applied schema version - skip probes when current
+            schema_version = conn.execute(text("PRAGMA user_version")).scalar() or 0
+            if schema_version >= SCHEMA_VERSION:
+                logger.debug(f"Database schema is current (version {schema_version}), skipping migrations")
+                return
+            
             # Check and add sanitized_text column if it doesn't exist
             result = conn.execute(
                 text("SELECT name FROM pragma_table_info('tickets') WHERE name='sanitized_text'")
@@ -84,6 +196,15 @@ def init_db():
                 logger.info("✅ prediction_details column added successfully")
             else:
                 logger.debug("prediction_details column already exists")
+            
+            # Create indexes on existing tables (create_all skips existing tables)
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_tickets_confidence ON tickets (confidence)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_tickets_created_at ON tickets (created_at)"))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_tickets_created_confidence ON tickets (created_at DESC, confidence)"
+            ))
+            
+            conn.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
+            logger.info(f"Database schema migrated to version {SCHEMA_VERSION}")
     except Exception as e:
         logger.warning(f"Could not migrate columns (may already exist): {str(e)}")
-
@@ -1,17 +1,25 @@
 """Security utilities for API key validation."""
-from fastapi import HTTPException, Security, status
+import hmac
+from fastapi import Depends, HTTPException, Security, status
 from fastapi.security import APIKeyHeader
-from app.core.config import settings
+from app.core.config import Settings, get_settings
 
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 
-async def verify_api_key(api_key: str = Security(api_key_header)) -> str:
+async def verify_api_key(
+    api_key: str = Security(api_key_header),
+    settings: Settings = Depends(get_settings)
+) -> str:
     """
     Verify the API key from the request header.
     
+    Uses hmac.compare_digest so the comparison time does not leak
+    how many leading characters of the key matched.
+    
     Args:
         api_key: The API key from the X-API-Key header
+        settings: Cached application settings
         
     Returns:
         The validated API key
@@ -25,7 +33,7 @@ async def verify_api_key(api_key: str = Security(api_key_header)) -> str:
             detail="Missing API Key. Please provide X-API-Key header."
         )
     
-    if api_key != settings.API_KEY:
+    if not hmac.compare_digest(api_key.encode("utf-8"), settings.API_KEY.encode("utf-8")):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid API Key."
@@ -1,22 +1,28 @@
 """FastAPI main application."""
+import asyncio
 import logging
-import traceback
-from typing import List
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import List, Optional
 from fastapi import FastAPI, HTTPException, Depends, status, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
+from celery import group
 from celery.result import AsyncResult
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.core.config import settings
+from sqlalchemy import func, case, select
+from app.core.config import Settings, get_settings
 from app.core.security import verify_api_key
 from app.models.schemas import (
     TicketInput,
+    TicketBatchInput,
     TaskResponse,
+    TaskBatchResponse,
     TaskStatusResponse,
     TaskStatus,
     AnalysisResult,
@@ -24,24 +30,78 @@ from app.models.schemas import (
     TicketHistory,
     StatsResponse
 )
-from app.worker.tasks import process_ticket_task
+from app.worker.tasks import persist_ticket_task, process_ticket_task
 from app.services.guardrails import sanitize_text
 from app.services.model_manager import model_manager
-from app.core.db import get_db, init_db
+from app.services.stats_cache import (
+    SUCCESS_CONFIDENCE_THRESHOLD,
+    get_ticket_counters,
+    set_ticket_counters
+)
+from app.core.db import get_read_db, init_db
 from app.models.sql_models import Ticket
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO if not settings.DEBUG else logging.DEBUG,
+    level=logging.INFO if not get_settings().DEBUG else logging.DEBUG,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+# Route paths are fixed when the module is imported
+API_V1_PREFIX = get_settings().API_V1_PREFIX
+
+
+def _init_database():
+    """Initialize the database, logging instead of raising on failure."""
+    logger.info("Initializing database...")
+    try:
+        init_db()
+        logger.info("Database initialized successfully")
+    except Exception as e:
+        logger.error("Failed to initialize database: %s", e)
+        logger.warning("Server will continue to start despite database initialization failure")
+        # DO NOT raise - allow server to start
+
+
+def _load_models():
+    """Load ML models, logging instead of raising on failure."""
+    logger.info("Loading ML models...")
+    try:
+        model_manager.load_models()
+        logger.info("Models loaded successfully")
+    except Exception as e:
+        logger.error("Failed to load models: %s", e)
+        logger.warning("Server will continue to start despite model loading failure (lazy loading will be used)")
+        # DO NOT raise - allow server to start (models will lazy-load on first request)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Initialize models and database on application startup.
+    
+    Database initialization (disk-bound) and model loading (network/CPU-bound)
+    are independent, so they run concurrently in worker threads.
+    
+    CRITICAL: This function must NOT raise exceptions, otherwise Cloud Run
+    will kill the container. The server MUST start listening on the port.
+    """
+    await asyncio.gather(
+        asyncio.to_thread(_init_database),
+        asyncio.to_thread(_load_models),
+        return_exceptions=True
+    )
+    yield
+
+
 # Initialize FastAPI app
 app = FastAPI(
-    title=settings.PROJECT_NAME,
-    version=settings.VERSION,
-    debug=settings.DEBUG
+    title=get_settings().PROJECT_NAME,
+    version=get_settings().VERSION,
+    debug=get_settings().DEBUG,
+    default_response_class=ORJSONResponse,  # orjson serializes responses (incl. datetimes) natively
+    lifespan=lifespan
 )
 
 # Initialize rate limiter
@@ -51,6 +111,30 @@ app.state.limiter = limiter
 # Add rate limiting middleware
 app.add_middleware(SlowAPIMiddleware)
 
+# Ticket endpoints share one per-IP budget counted in tickets, so a batch cannot
+# enqueue more tickets per minute than single requests can
+TICKET_RATE_LIMIT = "5/minute"
+TICKET_RATE_LIMIT_SCOPE = "tickets"
+
+
+def _batch_ticket_cost(request: Request) -> int:
+    """
+    Charge a batch request one rate limit hit per text.
+    The limit is checked after FastAPI has parsed and validated the body,
+    which Starlette caches on the request.
+    
+    Args:
+        request: Incoming batch request
+        
+    Returns:
+        Number of texts in the batch
+    """
+    body = getattr(request, "_json", None)
+    if isinstance(body, dict) and isinstance(body.get("texts"), list):
+        return max(len(body["texts"]), 1)
+    return 1
+
+
 # Add rate limit exception handler with custom JSON response
 @app.exception_handler(RateLimitExceeded)
 async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
@@ -59,7 +143,7 @@ async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
         content={
             "error": "Rate limit exceeded",
-            "message": "You have exceeded the rate limit of 5 requests per minute. Please try again later.",
+            "message": f"You have exceeded the ticket rate limit of {TICKET_RATE_LIMIT}. Please try again later.",
             "retry_after": exc.retry_after if hasattr(exc, 'retry_after') else None
         }
     )
@@ -74,35 +158,8 @@ app.add_middleware(
 )
 
 
-@app.on_event("startup")
-async def startup_event():
-    """
-    Initialize models and database on application startup.
-    
-    CRITICAL: This function must NOT raise exceptions, otherwise Cloud Run
-    will kill the container. The server MUST start listening on the port.
-    """
-    logger.info("Initializing database...")
-    try:
-        init_db()
-        logger.info("Database initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize database: {str(e)}")
-        logger.warning("Server will continue to start despite database initialization failure")
-        # DO NOT raise - allow server to start
-    
-    logger.info("Loading ML models...")
-    try:
-        model_manager.load_models()
-        logger.info("Models loaded successfully")
-    except Exception as e:
-        logger.error(f"Failed to load models: {str(e)}")
-        logger.warning("Server will continue to start despite model loading failure (lazy loading will be used)")
-        # DO NOT raise - allow server to start (models will lazy-load on first request)
-
-
 @app.get("/", tags=["Health"])
-async def root():
+async def root(settings: Settings = Depends(get_settings)):
     """Root endpoint for health check."""
     return {
         "message": "SmartSupport Backend API",
@@ -122,12 +179,12 @@ async def health_check():
 
 
 @app.post(
-    f"{settings.API_V1_PREFIX}/tickets",
+    f"{API_V1_PREFIX}/tickets",
     response_model=TaskResponse,
     status_code=status.HTTP_202_ACCEPTED,
     tags=["Tickets"]
 )
-@limiter.limit("5/minute")
+@limiter.shared_limit(TICKET_RATE_LIMIT, scope=TICKET_RATE_LIMIT_SCOPE)
 async def create_ticket(
     request: Request,
     ticket: TicketInput,
@@ -142,13 +199,18 @@ async def create_ticket(
     - Returns task ID for status tracking
     """
     try:
-        # Sanitize text before processing
-        sanitized_text = sanitize_text(ticket.text)
+        # Sanitize text before processing (CPU-bound, run off the event loop)
+        sanitized_text = await asyncio.to_thread(sanitize_text, ticket.text)
         
-        # Trigger async task
-        task = process_ticket_task.delay(sanitized_text)
+        # Trigger async task (Redis broker round-trip, run off the event loop)
+        # The DB write runs as a linked task, so the result is ready before the ticket is saved
+        task = await asyncio.to_thread(
+            process_ticket_task.apply_async,
+            (sanitized_text,),
+            link=persist_ticket_task.s()
+        )
         
-        logger.info(f"Created task {task.id} for ticket classification")
+        logger.info("Created task %s for ticket classification", task.id)
         
         return TaskResponse(
             task_id=task.id,
@@ -156,43 +218,140 @@ async def create_ticket(
             message="Ticket classification task created successfully"
         )
     except Exception as e:
-        logger.error(f"Error creating ticket task: {str(e)}")
+        logger.exception("Error creating ticket task")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create ticket task: {str(e)}"
         )
 
 
+def _enqueue_ticket_batch(texts: List[str]) -> List[str]:
+    """
+    Sanitize texts and enqueue one classification task per text.
+    
+    Args:
+        texts: Raw ticket texts
+        
+    Returns:
+        Celery task IDs, in input order
+    """
+    sanitized_texts = [sanitize_text(text) for text in texts]
+    
+    # One group publish reuses a single producer connection for every task message
+    group_result = group(
+        process_ticket_task.s(text).set(link=persist_ticket_task.s())
+        for text in sanitized_texts
+    ).apply_async()
+    return [result.id for result in group_result.results]
+
+
+@app.post(
+    f"{API_V1_PREFIX}/tickets/batch",
+    response_model=TaskBatchResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["Tickets"]
+)
+@limiter.shared_limit(TICKET_RATE_LIMIT, scope=TICKET_RATE_LIMIT_SCOPE, cost=_batch_ticket_cost)
+async def create_ticket_batch(
+    request: Request,
+    batch: TicketBatchInput,
+    api_key: str = Depends(verify_api_key)
+) -> TaskBatchResponse:
+    """
+    Create one ticket classification task per text in a single request.
+    
+    - Validates API key (batch size is validated by TicketBatchInput)
+    - Counts every text against the shared ticket rate limit
+    - Sanitizes each text (masks PII)
+    - Triggers one async Celery task per text
+    - Returns task IDs for status tracking
+    """
+    try:
+        # Sanitizing and publishing are blocking, run them off the event loop
+        task_ids = await asyncio.to_thread(_enqueue_ticket_batch, batch.texts)
+        
+        logger.info("Created %d tasks for batch ticket classification", len(task_ids))
+        
+        return TaskBatchResponse(
+            task_ids=task_ids,
+            status="PENDING",
+            message=f"{len(task_ids)} ticket classification tasks created successfully"
+        )
+    except Exception as e:
+        logger.exception("Error creating ticket batch")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create ticket batch: {str(e)}"
+        )
+
+
+# Map Celery states to our TaskStatus enum
+_CELERY_STATUS_MAP = {
+    "PENDING": TaskStatus.PENDING,
+    "STARTED": TaskStatus.STARTED,
+    "SUCCESS": TaskStatus.SUCCESS,
+    "FAILURE": TaskStatus.FAILURE,
+    "RETRY": TaskStatus.RETRY,
+    "REVOKED": TaskStatus.REVOKED,
+}
+
+# Bounded in-process cache of finished task responses (SUCCESS/FAILURE/REVOKED never change)
+_TERMINAL_STATES = frozenset({"SUCCESS", "FAILURE", "REVOKED"})
+_TERMINAL_CACHE_MAX_SIZE = 10_000
+_terminal_cache: "OrderedDict[str, TaskStatusResponse]" = OrderedDict()
+_terminal_cache_lock = threading.Lock()
+
+
+def _get_cached_terminal_result(task_id: str) -> Optional[TaskStatusResponse]:
+    """Return the cached response for a finished task, if any."""
+    with _terminal_cache_lock:
+        response = _terminal_cache.get(task_id)
+        if response is not None:
+            _terminal_cache.move_to_end(task_id)
+        return response
+
+
+def _cache_terminal_result(task_id: str, response: TaskStatusResponse):
+    """Cache the response for a finished task, evicting the least recently used entry."""
+    with _terminal_cache_lock:
+        _terminal_cache[task_id] = response
+        _terminal_cache.move_to_end(task_id)
+        if len(_terminal_cache) > _TERMINAL_CACHE_MAX_SIZE:
+            _terminal_cache.popitem(last=False)
+
+
 @app.get(
-    f"{settings.API_V1_PREFIX}/tickets/status/{{task_id}}",
+    f"{API_V1_PREFIX}/tickets/status/{{task_id}}",
     response_model=TaskStatusResponse,
     tags=["Tickets"]
 )
-async def get_ticket_status(
+def get_ticket_status(
     task_id: str,
     api_key: str = Depends(verify_api_key)
 ) -> TaskStatusResponse:
     """
     Get the status and result of a ticket classification task.
     
+    Declared as a sync function so FastAPI runs it in the threadpool:
+    the Celery result backend lookups are blocking Redis calls.
+    
     - Validates API key
     - Checks Celery task status
     - Returns result if task is completed
     """
     try:
+        # Terminal results are immutable - serve repeat polls without touching Redis
+        cached_response = _get_cached_terminal_result(task_id)
+        if cached_response is not None:
+            return cached_response
+        
         task_result = AsyncResult(task_id, app=process_ticket_task.app)
         
-        # Map Celery states to our TaskStatus enum
-        status_mapping = {
-            "PENDING": TaskStatus.PENDING,
-            "STARTED": TaskStatus.STARTED,
-            "SUCCESS": TaskStatus.SUCCESS,
-            "FAILURE": TaskStatus.FAILURE,
-            "RETRY": TaskStatus.RETRY,
-            "REVOKED": TaskStatus.REVOKED,
-        }
+        # Fetch state and result in a single backend round-trip
+        meta = task_result._get_task_meta()
+        celery_state = meta.get("status", "PENDING")
         
-        task_status = status_mapping.get(task_result.state, TaskStatus.PENDING)
+        task_status = _CELERY_STATUS_MAP.get(celery_state, TaskStatus.PENDING)
         
         response = TaskStatusResponse(
             task_id=task_id,
@@ -201,19 +360,19 @@ async def get_ticket_status(
             error=None
         )
         
-        if task_result.ready():
-            if task_result.successful():
+        if celery_state in _TERMINAL_STATES:
+            result_data = meta.get("result")
+            if celery_state == "SUCCESS":
                 # Task completed successfully
-                result_data = task_result.result
-                
                 # Convert predictions list to Prediction objects
+                # Data was produced by our own worker, so skip re-validation via model_construct
                 predictions_data = result_data.get("predictions", [])
                 predictions = [
-                    Prediction(label=pred.get("label", "unknown"), score=pred.get("score", 0.0))
+                    Prediction.model_construct(label=pred.get("label", "unknown"), score=pred.get("score", 0.0))
                     for pred in predictions_data
                 ]
                 
-                response.result = AnalysisResult(
+                response.result = AnalysisResult.model_construct(
                     language=result_data.get("language", "unknown"),
                     intent=result_data.get("intent", "unknown"),
                     confidence=result_data.get("confidence", 0.0),
@@ -225,12 +384,14 @@ async def get_ticket_status(
                 )
             else:
                 # Task failed
-                response.error = str(task_result.info) if task_result.info else "Task failed with unknown error"
+                response.error = str(result_data) if result_data else "Task failed with unknown error"
+            
+            _cache_terminal_result(task_id, response)
         
         return response
         
     except Exception as e:
-        logger.error(f"Error checking task status: {str(e)}")
+        logger.exception("Error checking task status")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to check task status: {str(e)}"
@@ -238,31 +399,41 @@ async def get_ticket_status(
 
 
 @app.get(
-    f"{settings.API_V1_PREFIX}/stats",
+    f"{API_V1_PREFIX}/stats",
     response_model=StatsResponse,
     tags=["Statistics"]
 )
-async def get_stats(
+def get_stats(
     api_key: str = Depends(verify_api_key),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> StatsResponse:
     """
     Get system statistics.
     
     - Validates API key
     - Returns total tickets, active tasks, and success rate
+    
+    Declared sync so FastAPI runs it in the threadpool - the Redis counter
+    calls and the SQL fallback would otherwise block the event loop.
     """
     try:
-        # Count total tickets in database
-        total_tickets = db.query(func.count(Ticket.id)).scalar() or 0
+        # Serve counts from the Redis counters; fall back to SQL on cache miss and backfill
+        counters = get_ticket_counters()
+        if counters is not None:
+            total_tickets, successful_tickets = counters
+        else:
+            # Count total and successful tickets in a single aggregate query
+            # (tickets with confidence > 0.5 are considered successful)
+            row = db.query(
+                func.count(Ticket.id),
+                func.sum(case((Ticket.confidence > SUCCESS_CONFIDENCE_THRESHOLD, 1), else_=0))
+            ).one()
+            total_tickets = row[0] or 0
+            successful_tickets = row[1] or 0
+            set_ticket_counters(total_tickets, successful_tickets)
         
         active_tasks = 0
         
-        # Calculate success rate (tickets with confidence > 0.5 are considered successful)
-        successful_tickets = db.query(func.count(Ticket.id)).filter(
-            Ticket.confidence > 0.5
-        ).scalar() or 0
-        
         success_rate = (successful_tickets / total_tickets) if total_tickets > 0 else 0.0
         
         return StatsResponse(
@@ -271,7 +442,7 @@ async def get_stats(
             success_rate=success_rate
         )
     except Exception as e:
-        logger.error(f"Error getting stats: {str(e)}")
+        logger.exception("Error getting stats")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get stats: {str(e)}"
@@ -279,13 +450,13 @@ async def get_stats(
 
 
 @app.get(
-    f"{settings.API_V1_PREFIX}/history",
+    f"{API_V1_PREFIX}/history",
     response_model=List[TicketHistory],
     tags=["History"]
 )
 async def get_history(
     api_key: str = Depends(verify_api_key),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = 10
 ) -> List[TicketHistory]:
     """
@@ -296,30 +467,43 @@ async def get_history(
     """
     try:
         # Get last N tickets ordered by creation date
-        tickets = db.query(Ticket).order_by(
-            Ticket.created_at.desc()
-        ).limit(limit).all()
+        # Project only the needed columns so rows come back as lightweight tuples (no ORM hydration)
+        tickets = db.execute(
+            select(
+                Ticket.id,
+                Ticket.text,
+                Ticket.sanitized_text,
+                Ticket.intent,
+                Ticket.confidence,
+                Ticket.language,
+                Ticket.response_text,
+                Ticket.translated_text,
+                Ticket.prediction_details,
+                Ticket.created_at
+            ).order_by(Ticket.created_at.desc()).limit(limit)
+        ).all()
+        
+        logger.info("Found %d tickets in database (requested limit: %d)", len(tickets), limit)
         
-        logger.info(f"Found {len(tickets)} tickets in database (requested limit: {limit})")
+        # Rows come straight from our own database - build models without re-validation
         
         return [
-            TicketHistory(
+            TicketHistory.model_construct(
                 id=ticket.id,
                 text=ticket.text,
-                sanitized_text=ticket.sanitized_text if hasattr(ticket, 'sanitized_text') else ticket.text,
+                sanitized_text=ticket.sanitized_text or ticket.text,
                 intent=ticket.intent,
                 confidence=ticket.confidence,
                 language=ticket.language,
                 response_text=ticket.response_text,
                 translated_text=ticket.translated_text,
-                prediction_details=getattr(ticket, 'prediction_details', None),
-                created_at=ticket.created_at.isoformat() if ticket.created_at else ""
+                prediction_details=ticket.prediction_details,
+                created_at=ticket.created_at
             )
             for ticket in tickets
         ]
     except Exception as e:
-        logger.error(f"Error getting history: {str(e)}")
-        logger.error(f"Full traceback: {traceback.format_exc()}")
+        logger.exception("Error getting history")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get history: {str(e)}"
@@ -327,20 +511,18 @@ async def get_history(
 
 
 @app.get(
-    f"{settings.API_V1_PREFIX}/debug/db",
+    f"{API_V1_PREFIX}/debug/db",
     tags=["Debug"]
 )
 async def debug_database(
     api_key: str = Depends(verify_api_key),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Debug endpoint to check database status and contents.
     Useful for troubleshooting without rebuilding containers.
     """
-    import traceback
     from app.core.db import DATABASE_PATH, DATABASE_URL
-    from pathlib import Path
     
     try:
         # Check if database file exists
@@ -350,8 +532,18 @@ async def debug_database(
         # Count tickets
         total_count = db.query(func.count(Ticket.id)).scalar() or 0
         
-        # Get sample tickets
-        sample_tickets = db.query(Ticket).order_by(Ticket.created_at.desc()).limit(5).all()
+        # Get sample tickets as plain row mappings (datetimes are serialized by orjson)
+        sample_tickets = db.execute(
+            select(
+                Ticket.id,
+                Ticket.intent,
+                Ticket.language,
+                func.coalesce(Ticket.sanitized_text, Ticket.text).label("sanitized_text"),
+                Ticket.prediction_details,
+                Ticket.translated_text,
+                Ticket.created_at
+            ).order_by(Ticket.created_at.desc()).limit(5)
+        ).mappings().all()
         
         return {
             "database_path": str(DATABASE_PATH),
@@ -359,25 +551,14 @@ async def debug_database(
             "database_exists": db_exists,
             "database_size_bytes": db_size,
             "total_tickets": total_count,
-            "sample_tickets": [
-                {
-                    "id": t.id,
-                    "intent": t.intent,
-                    "language": t.language,
-                    "sanitized_text": getattr(t, 'sanitized_text', t.text),
-                    "prediction_details": getattr(t, 'prediction_details', None),
-                    "translated_text": t.translated_text,
-                    "created_at": t.created_at.isoformat() if t.created_at else None
-                }
-                for t in sample_tickets
-            ],
+            "sample_tickets": [dict(row) for row in sample_tickets],
             "status": "ok"
         }
     except Exception as e:
-        logger.error(f"Debug endpoint error: {str(e)}")
+        # The traceback goes to the log only - never into a response body
+        logger.exception("Debug endpoint error")
         return {
             "error": str(e),
-            "traceback": traceback.format_exc(),
             "status": "error"
         }
 
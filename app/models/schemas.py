@@ -1,7 +1,9 @@
 """Pydantic models for request/response schemas."""
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Annotated, Optional, List
+from datetime import datetime
 from enum import Enum
+from app.core.config import get_settings
 
 
 class TaskStatus(str, Enum):
@@ -19,6 +21,16 @@ class TicketInput(BaseModel):
     text: str = Field(..., min_length=1, description="The text content to classify")
 
 
+class TicketBatchInput(BaseModel):
+    """Input schema for batch ticket classification request."""
+    texts: List[Annotated[str, Field(min_length=1)]] = Field(
+        ...,
+        min_length=1,
+        max_length=get_settings().TICKET_BATCH_MAX_SIZE,
+        description="Text contents to classify, one task per text"
+    )
+
+
 class Prediction(BaseModel):
     """Schema for a single prediction with label and confidence score."""
     label: str = Field(..., description="Predicted intent/classification label")
@@ -39,6 +51,8 @@ class AnalysisResult(BaseModel):
 
 class TicketHistory(BaseModel):
     """Schema for ticket history item."""
+    model_config = ConfigDict(from_attributes=True)
+    
     id: int = Field(..., description="Ticket ID")
     text: str = Field(..., description="Original ticket text")
     sanitized_text: Optional[str] = Field(None, description="PII-masked version of the input text")
@@ -48,7 +62,7 @@ class TicketHistory(BaseModel):
     response_text: Optional[str] = Field(None, description="Generated response")
     translated_text: Optional[str] = Field(None, description="English translation of the text (if original was Turkish)")
     prediction_details: Optional[str] = Field(None, description="JSON string of top 3 predictions")
-    created_at: str = Field(..., description="Creation timestamp")
+    created_at: datetime = Field(..., description="Creation timestamp")
 
 
 class StatsResponse(BaseModel):
@@ -65,6 +79,13 @@ class TaskResponse(BaseModel):
     message: str = Field(..., description="Human-readable status message")
 
 
+class TaskBatchResponse(BaseModel):
+    """Response schema for batch task creation."""
+    task_ids: List[str] = Field(..., description="Celery task IDs, in the order of the submitted texts")
+    status: str = Field(..., description="Current status of the tasks")
+    message: str = Field(..., description="Human-readable status message")
+
+
 class TaskStatusResponse(BaseModel):
     """Response schema for task status check."""
     task_id: str = Field(..., description="Celery task ID")
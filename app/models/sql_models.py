@@ -1,5 +1,5 @@
 """SQLAlchemy database models."""
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Index
 from sqlalchemy.sql import func
 from app.core.db import Base
 
@@ -12,12 +12,17 @@ class Ticket(Base):
     text = Column(Text, nullable=False, comment="Original ticket text")
     sanitized_text = Column(Text, nullable=True, comment="PII-masked version of the input text")
     intent = Column(String(255), nullable=False, comment="Predicted intent/classification")
-    confidence = Column(Float, nullable=False, comment="Confidence score of prediction")
+    confidence = Column(Float, nullable=False, index=True, comment="Confidence score of prediction")
     language = Column(String(10), nullable=False, comment="Detected language code")
     response_text = Column(Text, nullable=True, comment="Generated response text")
     translated_text = Column(Text, nullable=True, comment="English translation of the text (if original was Turkish)")
     prediction_details = Column(Text, nullable=True, comment="JSON string of top 3 predictions")
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    
+    __table_args__ = (
+        # Serves /history ORDER BY created_at DESC LIMIT N and combined dashboard queries
+        Index("ix_tickets_created_confidence", created_at.desc(), confidence),
+    )
     
     def __repr__(self):
         return f"<Ticket(id={self.id}, intent='{self.intent}', language='{self.language}')>"
@@ -1,53 +1,237 @@
 """PII masking and text sanitization service using Microsoft Presidio."""
 import re
 import logging
-from typing import List
-from presidio_analyzer import AnalyzerEngine, PatternRecognizer, Pattern
-from presidio_anonymizer import AnonymizerEngine
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+import phonenumbers
+from presidio_analyzer import AnalyzerEngine, PatternRecognizer, Pattern, RecognizerRegistry
+from presidio_analyzer.nlp_engine import NlpArtifacts, NlpEngine
+from presidio_analyzer.predefined_recognizers import (
+    CreditCardRecognizer,
+    CryptoRecognizer,
+    EmailRecognizer,
+    IpRecognizer,
+    PhoneRecognizer
+)
+from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# TCKN: 11 digits, first digit must be 1-9 (candidates are confirmed by is_valid_tckn)
+TCKN_REGEX = r"\b[1-9][0-9]{10}\b"
+
+# Phone number candidates: optional country code, area/operator code, then 5-8 more digits
+# (e.g. "+90 532 123 45 67", "0532 123 4567", "(555) 123-4567"). The regex alone also
+# matches amounts, dates and order numbers - candidates are confirmed by is_valid_phone_number
+PHONE_REGEX = r"(?<![\w+])(?:\+\d{1,3}[\s.-]?)?(?:\(\d{2,4}\)|\d{2,4})[\s.-]?\d{3}[\s.-]?\d{2,4}(?:[\s.-]?\d{2})?(?!\w)"
+
+# Regions phone numbers are validated against: Presidio's defaults plus Turkey
+PHONE_REGIONS = PhoneRecognizer.DEFAULT_SUPPORTED_REGIONS + ("TR",)
+
+# Same flags Presidio's PatternRecognizer compiles its regexes with
+_REGEX_FLAGS = re.DOTALL | re.MULTILINE | re.IGNORECASE
+
+# Cheap prefilter: a text without any of these characters cannot contain a supported entity
+_PII_HINT_RE = re.compile(r"[\d@:]")
+
+
+def is_valid_tckn(value: str) -> bool:
+    """
+    Check the Turkish ID (TCKN) checksum digits.
+    
+    Rules: the 10th digit is ((d1+d3+d5+d7+d9)*7 - (d2+d4+d6+d8)) mod 10,
+    and the 11th digit is the sum of the first 10 digits mod 10.
+    
+    Args:
+        value: Candidate string matched by TCKN_REGEX
+        
+    Returns:
+        True if the candidate is a valid TCKN
+    """
+    if len(value) != 11 or not value.isdigit() or value[0] == "0":
+        return False
+    
+    digits = [ord(char) - 48 for char in value]
+    odd_sum = digits[0] + digits[2] + digits[4] + digits[6] + digits[8]
+    even_sum = digits[1] + digits[3] + digits[5] + digits[7]
+    if (odd_sum * 7 - even_sum) % 10 != digits[9]:
+        return False
+    return (odd_sum + even_sum + digits[9]) % 10 == digits[10]
+
+
+def is_valid_phone_number(value: str) -> bool:
+    """
+    Check that a phone candidate is a valid number for one of PHONE_REGIONS.
+    
+    Uses the same python-phonenumbers matcher and leniency as Presidio's PhoneRecognizer,
+    which rejects amounts, dates and order/reference numbers the candidate regex accepts.
+    
+    Args:
+        value: Candidate string matched by PHONE_REGEX
+        
+    Returns:
+        True if the whole candidate is a valid phone number
+    """
+    for region in PHONE_REGIONS:
+        for match in phonenumbers.PhoneNumberMatcher(value, region, leniency=phonenumbers.Leniency.VALID):
+            if match.start == 0 and match.end == len(value):
+                return True
+    return False
+
+
+def may_contain_pii(text: str) -> bool:
+    """
+    Cheap precheck run before any masking work.
+    Every supported entity contains a digit, "@" (email) or ":" (IPv6).
+    
+    Args:
+        text: Input text
+        
+    Returns:
+        False if the text cannot contain a supported entity and can be used as-is
+    """
+    return bool(text) and _PII_HINT_RE.search(text) is not None
+
+
+class TCKNRecognizer(PatternRecognizer):
+    """Pattern recognizer for Turkish IDs (TCKN) that rejects candidates failing the checksum."""
+    
+    def validate_result(self, pattern_text: str) -> bool:
+        """Validate the TCKN checksum of a regex match."""
+        return is_valid_tckn(pattern_text)
+
+
+class NoOpNlpEngine(NlpEngine):
+    """
+    NLP engine stub that returns empty artifacts.
+    None of the supported entities need NER, so this keeps Presidio from loading spaCy.
+    Side effect: context words (e.g. "kimlik", "phone") no longer boost recognizer scores.
+    """
+    
+    def process_text(self, text: str, language: str) -> NlpArtifacts:
+        """Return empty NLP artifacts without tokenizing the text."""
+        return NlpArtifacts(
+            entities=[],
+            tokens=[],
+            tokens_indices=[],
+            lemmas=[],
+            nlp_engine=self,
+            language=language
+        )
+    
+    def process_batch(
+        self, texts: Iterable[str], language: str, **kwargs
+    ) -> Iterator[Tuple[str, NlpArtifacts]]:
+        """Return empty NLP artifacts for each text in the batch."""
+        for text in texts:
+            yield text, self.process_text(text, language)
+    
+    def is_stopword(self, word: str, language: str) -> bool:
+        """No stopword list is loaded."""
+        return False
+    
+    def is_punct(self, word: str, language: str) -> bool:
+        """No punctuation model is loaded."""
+        return False
+
 
 class PIIGuardrail:
     """
-    PII Guardrail using Microsoft Presidio for context-aware anonymization.
+    PII Guardrail using Microsoft Presidio for anonymization.
     Provides robust PII detection and masking with custom Turkish ID (TCKN) support.
+    Only pattern/checksum recognizers are registered - context-based (NER) recognition is disabled.
     """
     
     def __init__(self):
-        """Initialize Presidio analyzer and anonymizer engines."""
+        """Initialize the pre-compiled regex fast path and, unless PII_FAST_ONLY, the Presidio analyzer."""
+        settings = get_settings()
         try:
-            # Initialize analyzer engine
-            self.analyzer = AnalyzerEngine()
+            # The analyzer and its recognizer registry are only needed for use_presidio
+            # correctness checks - fast-only processes never build them
+            if settings.PII_FAST_ONLY:
+                self.analyzer = None
+                logger.info("PIIGuardrail initialized in fast-only mode (Presidio analyzer not loaded)")
+            else:
+                self.analyzer = self._build_analyzer()
+                logger.info("PIIGuardrail initialized with Presidio analyzer and custom TCKN recognizer")
             
-            # Add custom PatternRecognizer for Turkish ID (TCKN)
-            # TCKN: 11 digits, first digit must be 1-9
-            tckn_pattern = Pattern(
-                name="TCKN",
-                regex=r"\b[1-9][0-9]{10}\b",
-                score=0.9
-            )
+            # Pre-compiled regex fast path using Presidio's own pattern sources.
+            # Order sets priority when two entities match at the same position.
+            credit_card_recognizer = CreditCardRecognizer()
+            crypto_recognizer = CryptoRecognizer()
+            self._patterns: List[Tuple[str, re.Pattern, Optional[Callable[[str], bool]]]] = [
+                ("EMAIL_ADDRESS", re.compile(EmailRecognizer.PATTERNS[0].regex, _REGEX_FLAGS), None),
+                ("IP_ADDRESS", re.compile(IpRecognizer.PATTERNS[0].regex, _REGEX_FLAGS), None),  # IPv4
+                ("IP_ADDRESS", re.compile(IpRecognizer.PATTERNS[1].regex, _REGEX_FLAGS), None),  # IPv6
+                (
+                    "CREDIT_CARD",
+                    re.compile(CreditCardRecognizer.PATTERNS[0].regex, _REGEX_FLAGS),
+                    credit_card_recognizer.validate_result  # Luhn checksum
+                ),
+                (
+                    "CRYPTO",
+                    re.compile(CryptoRecognizer.PATTERNS[0].regex, _REGEX_FLAGS),
+                    crypto_recognizer.validate_result  # Base58 checksum
+                ),
+                ("TCKN", re.compile(TCKN_REGEX, _REGEX_FLAGS), is_valid_tckn),  # TCKN checksum
+                ("PHONE_NUMBER", re.compile(PHONE_REGEX, _REGEX_FLAGS), is_valid_phone_number),
+            ]
             
-            tckn_recognizer = PatternRecognizer(
-                supported_entity="TCKN",
-                patterns=[tckn_pattern],
-                context=["kimlik", "TCKN", "türk", "turkish", "identity", "id number"]
+            # All patterns as one alternation (group "p<priority>"), so a text is scanned once
+            # instead of once per pattern; at a given position the earliest alternative wins
+            self._combined_pattern = re.compile(
+                "|".join(
+                    f"(?P<p{priority}>{pattern.pattern})"
+                    for priority, (_, pattern, _) in enumerate(self._patterns)
+                ),
+                _REGEX_FLAGS
             )
             
-            # Add custom recognizer to analyzer
-            self.analyzer.registry.add_recognizer(tckn_recognizer)
-            logger.info("PIIGuardrail initialized with Presidio engines and custom TCKN recognizer")
-            
-            # Initialize anonymizer engine
-            self.anonymizer = AnonymizerEngine()
+            # Process-wide memo of fast-path results (retries and duplicate messages hit the cache)
+            self._anonymize_cached = lru_cache(maxsize=settings.PII_CACHE_SIZE)(self._anonymize_fast)
             
         except Exception as e:
             logger.error(f"Failed to initialize PIIGuardrail: {str(e)}")
             raise
     
-    def anonymize(self, text: str) -> str:
+    def _build_analyzer(self) -> AnalyzerEngine:
         """
-        Anonymize PII in the given text using Presidio.
+        Build the Presidio analyzer with a minimal registry and no spaCy pipeline.
+        
+        Returns:
+            AnalyzerEngine with recognizers for the supported entities only
+        """
+        # Build a minimal registry with only the recognizers for the supported entities
+        registry = RecognizerRegistry()
+        registry.add_recognizer(PhoneRecognizer(supported_regions=PHONE_REGIONS))
+        registry.add_recognizer(EmailRecognizer())
+        registry.add_recognizer(CreditCardRecognizer())
+        registry.add_recognizer(CryptoRecognizer())
+        registry.add_recognizer(IpRecognizer())
+        
+        # Add custom PatternRecognizer for Turkish ID (TCKN)
+        # TCKN: 11 digits, first digit must be 1-9, checksum validated
+        tckn_pattern = Pattern(
+            name="TCKN",
+            regex=TCKN_REGEX,
+            score=0.9
+        )
+        
+        tckn_recognizer = TCKNRecognizer(
+            supported_entity="TCKN",
+            patterns=[tckn_pattern],
+            context=["kimlik", "TCKN", "türk", "turkish", "identity", "id number"]
+        )
+        
+        # Add custom recognizer to registry
+        registry.add_recognizer(tckn_recognizer)
+        
+        # Initialize analyzer engine without spaCy (no-op NLP engine)
+        return AnalyzerEngine(registry=registry, nlp_engine=NoOpNlpEngine())
+    
+    def anonymize(self, text: str, use_presidio: bool = False) -> str:
+        """
+        Anonymize PII in the given text.
         
         Detects and masks:
         - PHONE_NUMBER
@@ -57,53 +241,150 @@ class PIIGuardrail:
         - IP_ADDRESS
         - TCKN (Turkish ID - custom recognizer)
         
+        By default a single pass of pre-compiled regexes is used, with results
+        memoized in an LRU cache; the full Presidio pipeline is kept behind
+        use_presidio for correctness checks. Both paths build the masked
+        output with one join instead of Presidio's AnonymizerEngine.
+        
         Args:
             text: Input text containing potentially sensitive information
+            use_presidio: Detect PII with the Presidio analyzer instead of the fast regexes
+                (ignored in PII_FAST_ONLY mode, where no analyzer is loaded)
             
         Returns:
             Anonymized text with PII masked (e.g., <PHONE_NUMBER>, <EMAIL_ADDRESS>)
         """
-        if not text or not text.strip():
+        if not may_contain_pii(text):
             return text
         
         try:
-            supported_entities = [
-                "PHONE_NUMBER",
-                "EMAIL_ADDRESS",
-                "CREDIT_CARD",
-                "CRYPTO",
-                "IP_ADDRESS",
-                "TCKN"  # Custom Turkish ID recognizer
-            ]
-            
-            # Analyze text for PII entities
-            analyzer_results = self.analyzer.analyze(
-                text=text,
-                language="en",  # Presidio works best with English, but will detect patterns in any language
-                entities=supported_entities
-            )
-            
-            if not analyzer_results:
-                logger.debug("No PII entities detected in text")
-                return text
-            
-            # Anonymize detected entities
-            anonymized_result = self.anonymizer.anonymize(
-                text=text,
-                analyzer_results=analyzer_results
-            )
-            
-            masked_text = anonymized_result.text
-            logger.debug(f"Anonymized text: {len(analyzer_results)} PII entities detected and masked")
-            
-            return masked_text
-            
+            if use_presidio and self.analyzer is not None:
+                return self._anonymize_presidio(text)
+            if len(text) <= get_settings().PII_CACHE_MAX_TEXT_LENGTH:
+                return self._anonymize_cached(text)
+            return self._anonymize_fast(text)
         except Exception as e:
             logger.error(f"Error in PII anonymization: {str(e)}")
             # Fallback: return original text if anonymization fails
             # In production, you might want to raise or use a simpler fallback
             logger.warning("Falling back to original text due to anonymization error")
             return text
+    
+    def _anonymize_fast(self, text: str) -> str:
+        """Mask PII with a single scan of the combined regex and a single output join."""
+        parts = []
+        prev_end = 0
+        pos = 0
+        search = self._combined_pattern.search
+        
+        while True:
+            match = search(text, pos)
+            if match is None:
+                break
+            
+            start = match.start()
+            hit = self._resolve_match(text, match)
+            if hit is None:
+                # Checksum rejected every pattern here - resume scanning inside the candidate
+                pos = start + 1
+                continue
+            
+            entity, end = hit
+            parts.append(text[prev_end:start])
+            parts.append(f"<{entity}>")
+            prev_end = pos = end
+        
+        if not parts:
+            logger.debug("No PII entities detected in text")
+            return text
+        
+        parts.append(text[prev_end:])
+        logger.debug("Anonymized text: %d PII spans detected and masked", len(parts) // 2)
+        return "".join(parts)
+    
+    def _resolve_match(self, text: str, match: re.Match) -> Optional[Tuple[str, int]]:
+        """
+        Pick the entity for a combined-regex match.
+        
+        The alternation only reports the first pattern matching at a position, so the
+        lower-priority patterns are re-tried there: the longest checksum-valid match
+        wins, ties go to the higher-priority pattern.
+        
+        Args:
+            text: Text being scanned
+            match: Match of the combined pattern
+            
+        Returns:
+            Tuple of (entity, end offset), or None if no pattern validates at this position
+        """
+        start = match.start()
+        first = int(match.lastgroup[1:])
+        best = None
+        for priority in range(first, len(self._patterns)):
+            entity, pattern, validator = self._patterns[priority]
+            candidate = match if priority == first else pattern.match(text, start)
+            if candidate is None or (best is not None and candidate.end() <= best[1]):
+                continue
+            if validator is None or validator(candidate.group()):
+                best = (entity, candidate.end())
+        
+        return best
+    
+    def _anonymize_presidio(self, text: str) -> str:
+        """Mask PII detected by the Presidio analyzer engine."""
+        supported_entities = [
+            "PHONE_NUMBER",
+            "EMAIL_ADDRESS",
+            "CREDIT_CARD",
+            "CRYPTO",
+            "IP_ADDRESS",
+            "TCKN"  # Custom Turkish ID recognizer
+        ]
+        
+        # Analyze text for PII entities
+        analyzer_results = self.analyzer.analyze(
+            text=text,
+            language="en",  # Presidio works best with English, but will detect patterns in any language
+            entities=supported_entities
+        )
+        
+        if not analyzer_results:
+            logger.debug("No PII entities detected in text")
+            return text
+        
+        # Same single-join rewrite as the fast path; on an exact-span tie the higher score wins
+        spans = [
+            (result.start, -result.end, -result.score, result.entity_type)
+            for result in analyzer_results
+        ]
+        logger.debug("Anonymized text: %d PII entities detected and masked", len(analyzer_results))
+        return _join_masked(text, spans)
+
+
+def _join_masked(text: str, spans: List[Tuple[int, int, float, str]]) -> str:
+    """
+    Replace PII spans with <ENTITY> placeholders in a single output join.
+    
+    Args:
+        text: Original text
+        spans: (start, -end, tie_breaker, entity) tuples - the earliest, then longest,
+            then lowest tie_breaker span wins; spans overlapping a kept span are dropped
+            
+    Returns:
+        Text with each kept span replaced by its placeholder
+    """
+    spans = sorted(spans)
+    parts = []
+    prev_end = 0
+    for start, neg_end, _, entity in spans:
+        if start < prev_end:
+            continue
+        parts.append(text[prev_end:start])
+        parts.append(f"<{entity}>")
+        prev_end = -neg_end
+    parts.append(text[prev_end:])
+    
+    return "".join(parts)
 
 
 # Global instance - initialized once to avoid reloading models
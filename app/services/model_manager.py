@@ -1,15 +1,80 @@
 """Model manager singleton for loading and managing ML models."""
+import os
+import re
+import asyncio
+import time
+import queue
 import logging
-from typing import Dict, Any, List
-from langdetect import detect, LangDetectException
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+from transformers import AutoTokenizer, AutoModelForSequenceClassification, AutoModelForSeq2SeqLM
 from deep_translator import GoogleTranslator
 import torch
-import torch.nn.functional as F
-from app.core.config import settings
+from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+@dataclass(slots=True)
+class PredictionResult:
+    """Classification result returned by ModelManager.predict()."""
+    language: str  # Original detected language (e.g. 'tr' even when the English model classified a translation)
+    intent: str
+    confidence: float
+    predictions: List[Dict[str, Any]]  # Top-k {"label", "score"} dicts
+    translated_text: Optional[str] = None  # English translation used for classification, if any
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict form for JSON boundaries (Celery results, API payloads)."""
+        return {
+            "language": self.language,
+            "intent": self.intent,
+            "confidence": self.confidence,
+            "predictions": self.predictions,
+            "translated_text": self.translated_text,
+        }
+
+
+# Letters that only occur in Turkish text (among the two supported languages)
+_TURKISH_CHARS_RE = re.compile("[çğıİöşüÇĞÖŞÜ]")
+_WORD_RE = re.compile(r"\w+")
+
+# Frequent short words used to decide texts written without Turkish letters
+_TURKISH_STOPWORDS = frozenset({
+    "ve", "bir", "bu", "da", "de", "ile", "icin", "ne", "mi", "mu", "ben", "sen",
+    "var", "yok", "ama", "nasil", "neden", "lutfen", "hesap", "hesabim", "kart", "kartim"
+})
+_ENGLISH_STOPWORDS = frozenset({
+    "the", "a", "an", "and", "is", "are", "to", "of", "my", "i", "you", "it",
+    "in", "on", "for", "with", "can", "how", "what", "why", "please", "not"
+})
+
+
+def detect_language(text: str) -> str:
+    """
+    Decide whether the text is Turkish or English.
+    
+    Only these two languages are supported, so a full n-gram language
+    identifier is not needed: Turkish-specific letters and stopword hits
+    are counted against English stopword hits.
+    
+    Args:
+        text: Input text
+        
+    Returns:
+        "tr" for Turkish, "en" otherwise
+    """
+    turkish_score = len(_TURKISH_CHARS_RE.findall(text))
+    english_score = 0
+    for word in _WORD_RE.findall(text.lower()):
+        if word in _TURKISH_STOPWORDS:
+            turkish_score += 1
+        elif word in _ENGLISH_STOPWORDS:
+            english_score += 1
+    
+    return "tr" if turkish_score > english_score else "en"
+
 
 class ModelManager:
     """
@@ -19,54 +84,205 @@ class ModelManager:
     """
     _instance = None
     _initialized = False
+    # Guards instance creation and model loading so models are never loaded twice
+    _lock = threading.Lock()
     
     def __new__(cls):
         """Ensure only one instance exists (Singleton pattern)."""
-        if cls._instance is None:
-            cls._instance = super(ModelManager, cls).__new__(cls)
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(ModelManager, cls).__new__(cls)
         return cls._instance
     
     def __init__(self):
         """Initialize models if not already done."""
-        if not ModelManager._initialized:
+        with ModelManager._lock:
+            if ModelManager._initialized:
+                return
+            
             # Turkish model removed - using translation layer instead
             self.turkish_tokenizer = None
             self.turkish_model = None
             self.english_tokenizer = None
             self.english_model = None
+            self.english_model_traced = None  # Fixed-shape TorchScript model for short single texts
+            self._id2label = []  # Label name per class id, filled by load_models
+            # Local tr->en translation model (GoogleTranslator is only a fallback)
+            self.translator_tokenizer = None
+            self.translator_model = None
+            # Micro-batching queue of (text, top_k, future), drained by a background thread
+            self._batch_queue = queue.Queue()
+            self._batch_thread = None
+            self._batch_lock = threading.Lock()
             self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
             ModelManager._initialized = True
             logger.info(f"ModelManager initialized. Using device: {self.device}")
     
     def load_models(self):
         """
-        Load English model only (Turkish model removed - using translation instead).
+        Load the English model and the local Turkish-to-English translation model
+        (Turkish classifier removed - using translation instead).
         This method is idempotent - it will not reload models if they are already loaded.
+        Thread-safe: concurrent callers wait for a single load instead of loading twice.
         """
+        settings = get_settings()
         # Check if model is already loaded (idempotent check)
         if self.english_model is not None:
             logger.debug("English model already loaded, skipping reload")
             return
         
-        try:
-            # Turkish model loading removed - we use translation layer instead
-            # This saves RAM and improves accuracy
-            logger.info("Turkish model removed - using translation layer instead")
-            
-            logger.info("Loading English model...")
-            self.english_tokenizer = AutoTokenizer.from_pretrained(settings.ENGLISH_MODEL)
-            self.english_model = AutoModelForSequenceClassification.from_pretrained(
-                settings.ENGLISH_MODEL
-            )
-            self.english_model.to(self.device)
-            self.english_model.eval()
+        with ModelManager._lock:
+            # Another thread may have finished loading while this one waited for the lock
+            if self.english_model is not None:
+                logger.debug("English model loaded by another thread, skipping reload")
+                return
+            
+            self._configure_threads()
+            
+            try:
+                # Turkish model loading removed - we use translation layer instead
+                # This saves RAM and improves accuracy
+                logger.info("Turkish model removed - using translation layer instead")
+                
+                logger.info("Loading English model...")
+                english_tokenizer = AutoTokenizer.from_pretrained(settings.ENGLISH_MODEL, use_fast=True)  # Rust tokenizer
+                english_model = AutoModelForSequenceClassification.from_pretrained(
+                    settings.ENGLISH_MODEL
+                )
+                english_model.to(self.device)
+                english_model.eval()
+                
+                # Label names as a list indexed by class id - no per-request getattr or dict lookup
+                id2label = getattr(english_model.config, "id2label", None) or {}
+                id2label_list = [id2label.get(i, f"class_{i}") for i in range(english_model.config.num_labels)]
+                
+                # Half precision halves memory traffic; CPU kernels for FP16 are slower, so CUDA only
+                if settings.USE_FP16 and self.device.type == "cuda":
+                    english_model = english_model.half()
+                    logger.info("English model cast to FP16")
+                
+                # Dynamic int8 quantization of Linear layers uses VNNI/AVX-512 int8 GEMM kernels on CPU
+                if settings.USE_INT8_QUANTIZATION and self.device.type == "cpu":
+                    english_model = torch.ao.quantization.quantize_dynamic(
+                        english_model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                    logger.info("English model quantized to int8")
+                
+                english_model_traced = None
+                if settings.TRACE_SEQ_LEN > 0 and not settings.USE_TORCH_COMPILE:
+                    english_model_traced = self._trace_model(english_model, english_tokenizer, settings.TRACE_SEQ_LEN)
+                    logger.info(f"English model traced at {settings.TRACE_SEQ_LEN} tokens")
+                
+                if settings.USE_TORCH_COMPILE:
+                    # dynamic=True avoids a recompile for every new sequence length
+                    english_model = torch.compile(english_model, dynamic=True)
+                    logger.info("English model compiled with torch.compile")
+                
+            except Exception as e:
+                logger.error(f"Error loading models: {str(e)}")
+                raise
+            
+            self._load_translator()
+            
+            # Publish the model last - lock-free readers treat a non-None model as fully loaded
+            self.english_tokenizer = english_tokenizer
+            self._id2label = id2label_list
+            self.english_model_traced = english_model_traced
+            self.english_model = english_model
             logger.info("English model loaded successfully")
+    
+    def _trace_model(self, model, tokenizer, seq_len: int):
+        """
+        Trace the classifier with TorchScript at a fixed sequence length.
+        A fixed shape lets the runtime specialize kernels instead of re-planning per call.
+        
+        Args:
+            model: Eager classifier model
+            tokenizer: Tokenizer whose output keys become the traced inputs
+            seq_len: Sequence length the traced model accepts
             
+        Returns:
+            Traced module returning a dict with 'logits'
+        """
+        example = tokenizer("", padding="max_length", max_length=seq_len, return_tensors="pt")
+        example = {key: value.to(self.device) for key, value in example.items()}
+        with torch.no_grad():
+            return torch.jit.trace(model, example_kwarg_inputs=example, strict=False)
+    
+    def _reset_after_fork(self):
+        """
+        Re-create locks and the batching queue in a forked child process.
+        Loaded models are kept (shared copy-on-write with the parent), but a lock held
+        by a parent thread at fork time would stay locked forever, and the parent's
+        batching thread does not exist in the child.
+        """
+        ModelManager._lock = threading.Lock()
+        self._batch_lock = threading.Lock()
+        self._batch_queue = queue.Queue()
+        self._batch_thread = None
+    
+    def _configure_threads(self):
+        """
+        Size torch's CPU thread pools for per-request latency.
+        Each Celery prefork child runs its own pools, so the default (one thread per core)
+        oversubscribes the CPU; keep concurrency x TORCH_NUM_THREADS <= physical cores.
+        """
+        torch.set_num_threads(get_settings().TORCH_NUM_THREADS)
+        try:
+            torch.set_num_interop_threads(1)  # Single-request forward passes have no inter-op parallelism
+        except RuntimeError:
+            # Can only be set once, before any inter-op parallel work - keep the current value
+            logger.debug("torch inter-op thread pool already initialized")
+        logger.info(f"torch CPU threads: {torch.get_num_threads()} intra-op, {torch.get_num_interop_threads()} inter-op")
+    
+    def _load_translator(self):
+        """
+        Load the local Turkish-to-English translation model on the same device.
+        A load failure is not fatal - translation then falls back to GoogleTranslator.
+        """
+        settings = get_settings()
+        try:
+            logger.info(f"Loading translation model {settings.TRANSLATION_MODEL}...")
+            self.translator_tokenizer = AutoTokenizer.from_pretrained(settings.TRANSLATION_MODEL)
+            translator_model = AutoModelForSeq2SeqLM.from_pretrained(settings.TRANSLATION_MODEL)
+            translator_model.to(self.device)
+            translator_model.eval()
+            if settings.USE_FP16 and self.device.type == "cuda":
+                translator_model = translator_model.half()
+            self.translator_model = translator_model
+            logger.info("Translation model loaded successfully")
         except Exception as e:
-            logger.error(f"Error loading models: {str(e)}")
-            raise
+            self.translator_tokenizer = None
+            self.translator_model = None
+            logger.warning(f"Could not load translation model, falling back to GoogleTranslator: {str(e)}")
+    
+    def _translate_to_english(self, text: str) -> str:
+        """
+        Translate Turkish text to English, locally when the translation model is loaded.
+        
+        Args:
+            text: Turkish input text
+            
+        Returns:
+            English translation
+        """
+        if self.translator_model is None:
+            translator = GoogleTranslator(source='auto', target='en')
+            return translator.translate(text)
+        
+        inputs = self.translator_tokenizer(
+            text,
+            return_tensors="pt",
+            truncation=True,
+            max_length=512
+        ).to(self.device)
+        
+        with torch.inference_mode():
+            output_ids = self.translator_model.generate(**inputs, num_beams=1, max_new_tokens=128)
+        
+        return self.translator_tokenizer.decode(output_ids[0], skip_special_tokens=True)
     
-    def predict(self, text: str, top_k: int = 3) -> Dict[str, Any]:
+    def predict(self, text: str, top_k: int = 3) -> PredictionResult:
         """
         Predict intent classification for the given text.
         
@@ -84,43 +300,26 @@ class ModelManager:
             top_k: Number of top predictions to return (default: 3)
             
         Returns:
-            Dictionary with 'language', 'intent', 'confidence', and 'predictions' keys
-            where 'predictions' is a list of top_k predictions with labels and scores
-            Note: 'language' will be the original detected language (e.g., 'tr' for Turkish)
+            PredictionResult with language, intent, confidence, predictions and translated_text,
+            where predictions is a list of top_k predictions with labels and scores
+            Note: language will be the original detected language (e.g., 'tr' for Turkish)
             
         Raises:
-            ValueError: If language detection fails or models cannot be loaded
+            ValueError: If models cannot be loaded
         """
         # Lazy loading: Check if model is loaded, if not, load it
         if self.english_model is None:
             logger.warning("⚠️ Worker process cache miss. Loading models...")
             self.load_models()
         
-        # Detect language
-        try:
-            detected_lang = detect(text)
-        except LangDetectException as e:
-            logger.warning(f"Language detection failed: {str(e)}. Defaulting to English.")
-            detected_lang = "en"
+        # Detect language (tr/en only)
+        detected_lang = detect_language(text)
         
         # Translation layer: If Turkish, translate to English
         text_for_prediction = text
-        translated_text = None
+        translated_text = None  # No translation needed for English
         if detected_lang == "tr":
-            try:
-                logger.debug(f"Translating Turkish text to English: {text[:50]}...")
-                translator = GoogleTranslator(source='auto', target='en')
-                text_for_prediction = translator.translate(text)
-                translated_text = text_for_prediction  # Store the translated text
-                logger.debug(f"Translated text: {text_for_prediction[:50]}...")
-            except Exception as e:
-                logger.warning(f"Translation failed: {str(e)}. Using original text.")
-                # Fallback: use original text if translation fails
-                text_for_prediction = text
-                translated_text = None
-        elif detected_lang == "en":
-            # For English, translated_text can be the same as original or None
-            translated_text = None  # No translation needed for English
+            text_for_prediction, translated_text = self._translate_for_prediction(text)
         
         # Use English model for all predictions (translated or original)
         # But preserve the original language in the response
@@ -128,69 +327,239 @@ class ModelManager:
         
         # Ensure the returned language is the original detected language
         # This is important so the worker knows to generate a Turkish response
-        result["language"] = detected_lang
+        return PredictionResult(
+            language=detected_lang,
+            intent=result["intent"],
+            confidence=result["confidence"],
+            predictions=result["predictions"],
+            translated_text=translated_text
+        )
+    
+    async def predict_async(self, text: str, top_k: int = 3) -> PredictionResult:
+        """
+        Awaitable variant of predict() for async callers such as FastAPI endpoints.
+        
+        Model loading, translation and inference run in worker threads so the event
+        loop keeps serving other requests. With batching enabled the inference step
+        awaits the batch future directly instead of blocking a thread on it.
+        
+        Args:
+            text: Input text to classify
+            top_k: Number of top predictions to return (default: 3)
+            
+        Returns:
+            Same PredictionResult as predict()
+        """
+        # Lazy loading: Check if model is loaded, if not, load it
+        if self.english_model is None:
+            logger.warning("⚠️ Worker process cache miss. Loading models...")
+            await asyncio.to_thread(self.load_models)
+        
+        # Detect language (tr/en only) - cheap enough to run inline
+        detected_lang = detect_language(text)
+        
+        text_for_prediction = text
+        translated_text = None
+        if detected_lang == "tr":
+            text_for_prediction, translated_text = await asyncio.to_thread(self._translate_for_prediction, text)
         
-        # Add translated text to result
-        result["translated_text"] = translated_text
+        if get_settings().INFERENCE_BATCH_MAX_SIZE > 1:
+            result = await asyncio.wrap_future(self._submit_to_batch(text_for_prediction, top_k))
+        else:
+            result = await asyncio.to_thread(self._predict_english, text_for_prediction, detected_lang, top_k)
+        
+        return PredictionResult(
+            language=detected_lang,
+            intent=result["intent"],
+            confidence=result["confidence"],
+            predictions=result["predictions"],
+            translated_text=translated_text
+        )
+    
+    def _translate_for_prediction(self, text: str) -> Tuple[str, Optional[str]]:
+        """
+        Translate Turkish text to English for the classifier.
         
-        return result
+        Args:
+            text: Turkish input text
+            
+        Returns:
+            Tuple of (text to classify, translated text or None if translation failed)
+        """
+        try:
+            logger.debug("Translating Turkish text to English: %.50s...", text)
+            translated_text = self._translate_to_english(text)
+            logger.debug("Translated text: %.50s...", translated_text)
+            return translated_text, translated_text
+        except Exception as e:
+            logger.warning(f"Translation failed: {str(e)}. Using original text.")
+            # Fallback: use original text if translation fails
+            return text, None
     
     def _predict_english(self, text: str, original_lang: str, top_k: int = 3) -> Dict[str, Any]:
         """
         Run inference using English model and return top K predictions.
         
+        When INFERENCE_BATCH_MAX_SIZE > 1, the text is queued and classified
+        together with other concurrent calls in a single forward pass.
+        
         Args:
             text: Text to classify (may be translated from Turkish)
             original_lang: Original detected language (preserved in response)
             top_k: Number of top predictions to return
         """
         try:
-            inputs = self.english_tokenizer(
-                text,
-                return_tensors="pt",
-                truncation=True,
-                max_length=512,
-                padding=True
-            ).to(self.device)
-            
-            with torch.no_grad():
-                outputs = self.english_model(**inputs)
-                logits = outputs.logits
-                probabilities = F.softmax(logits, dim=-1)
-                
-                # Get top K predictions
-                top_probs, top_indices = torch.topk(probabilities, k=min(top_k, probabilities.size(-1)), dim=-1)
-                
-                # Get label mapping
-                id2label = getattr(self.english_model.config, "id2label", None)
-                
-                # Build predictions list
-                predictions = []
-                for i in range(top_k):
-                    if i < top_indices.size(-1):
-                        idx = top_indices[0][i].item()
-                        prob = top_probs[0][i].item()
-                        label = id2label[idx] if id2label else f"class_{idx}"
-                        predictions.append({
-                            "label": label,
-                            "score": prob
-                        })
-                
-                # Get top prediction for backward compatibility
-                top_idx = top_indices[0][0].item()
-                top_prob = top_probs[0][0].item()
-                top_label = id2label[top_idx] if id2label else f"class_{top_idx}"
-                
-                return {
-                    "language": original_lang,  # Preserve original language
-                    "intent": top_label,
-                    "confidence": top_prob,
-                    "predictions": predictions
-                }
+            if get_settings().INFERENCE_BATCH_MAX_SIZE > 1:
+                result = self._submit_to_batch(text, top_k).result()
+            else:
+                result = self._predict_english_batch([text], top_k)[0]
+            
+            return {"language": original_lang, **result}  # Preserve original language
         except Exception as e:
             logger.error(f"Error in English model prediction: {str(e)}")
             raise
+    
+    def _predict_english_batch(self, texts: List[str], top_k: int) -> List[Dict[str, Any]]:
+        """
+        Classify a batch of texts with a single padded forward pass.
+        
+        Args:
+            texts: Texts to classify
+            top_k: Number of top predictions to return per text
+            
+        Returns:
+            List of dictionaries with 'intent', 'confidence' and 'predictions', in input order
+        """
+        settings = get_settings()
+        inputs = self.english_tokenizer(
+            texts,
+            return_tensors="pt",
+            truncation=True,
+            max_length=512,
+            padding=len(texts) > 1  # A single sequence never needs padding
+        )
+        
+        # Short single texts run on the traced model, padded to its fixed length
+        # (padded positions are masked out by attention_mask)
+        seq_len = inputs["input_ids"].size(-1)
+        model = self.english_model
+        if self.english_model_traced is not None and len(texts) == 1 and seq_len <= settings.TRACE_SEQ_LEN:
+            model = self.english_model_traced
+            inputs = {
+                key: torch.nn.functional.pad(value, (0, settings.TRACE_SEQ_LEN - seq_len))
+                for key, value in inputs.items()
+            }
+        
+        if self.device.type == "cuda":
+            # Pinned host memory lets the host-to-device copy run asynchronously
+            inputs = {key: value.pin_memory().to(self.device, non_blocking=True) for key, value in inputs.items()}
+        
+        with torch.inference_mode():
+            outputs = model(**inputs)
+            logits = outputs["logits"].float()  # Normalize in FP32 even when the model runs in FP16
+            
+            # Softmax is monotonic: rank on logits, then normalize only the top K values.
+            # exp(logit - logsumexp) gives the same probabilities as a full softmax.
+            if top_k == 1:
+                # Single-answer calls: a max reduction instead of a sort-based topk
+                top_logits, top_indices = logits.max(dim=-1, keepdim=True)
+            else:
+                top_logits, top_indices = torch.topk(logits, k=min(top_k, logits.size(-1)), dim=-1)
+            top_probs = torch.exp(top_logits - torch.logsumexp(logits, dim=-1, keepdim=True))
+        
+        id2label = self._id2label
+        
+        # One device-to-host copy for the whole batch instead of an .item() sync per value
+        top_probs_list = top_probs.tolist()
+        top_idx_list = top_indices.tolist()
+        
+        results = []
+        for row_probs, row_indices in zip(top_probs_list, top_idx_list):
+            # Build predictions list
+            predictions = []
+            for idx, prob in zip(row_indices, row_probs):
+                label = id2label[idx]
+                predictions.append({
+                    "label": label,
+                    "score": prob
+                })
+            
+            # Top prediction for backward compatibility
+            results.append({
+                "intent": predictions[0]["label"],
+                "confidence": predictions[0]["score"],
+                "predictions": predictions
+            })
+        
+        return results
+    
+    def _submit_to_batch(self, text: str, top_k: int) -> Future:
+        """
+        Queue a text for batched classification.
+        
+        Args:
+            text: Text to classify
+            top_k: Number of top predictions to return
+            
+        Returns:
+            Future resolved with the prediction dictionary
+        """
+        self._ensure_batch_worker()
+        future = Future()
+        self._batch_queue.put((text, top_k, future))
+        return future
+    
+    def _ensure_batch_worker(self):
+        """Start the batching thread if it is not running (threads do not survive a fork)."""
+        if self._batch_thread is not None and self._batch_thread.is_alive():
+            return
+        
+        with self._batch_lock:
+            if self._batch_thread is None or not self._batch_thread.is_alive():
+                self._batch_thread = threading.Thread(
+                    target=self._batch_worker_loop,
+                    name="inference-batcher",
+                    daemon=True
+                )
+                self._batch_thread.start()
+                logger.info(f"Inference batching started (max size {get_settings().INFERENCE_BATCH_MAX_SIZE})")
+    
+    def _batch_worker_loop(self):
+        """Collect queued texts for up to INFERENCE_BATCH_MAX_WAIT_MS and classify them together."""
+        settings = get_settings()
+        max_size = settings.INFERENCE_BATCH_MAX_SIZE
+        max_wait = settings.INFERENCE_BATCH_MAX_WAIT_MS / 1000
+        
+        while True:
+            batch = [self._batch_queue.get()]
+            deadline = time.monotonic() + max_wait
+            while len(batch) < max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._batch_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                results = self._predict_english_batch(
+                    [text for text, _, _ in batch],
+                    max(top_k for _, top_k, _ in batch)
+                )
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            
+            for (_, top_k, future), result in zip(batch, results):
+                result["predictions"] = result["predictions"][:top_k]
+                future.set_result(result)
 
 
 # Global instance
 model_manager = ModelManager()
+
+# Celery prefork children inherit the instance; give them fresh locks and batching state
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=model_manager._reset_after_fork)
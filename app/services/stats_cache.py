@@ -0,0 +1,142 @@
+"""Redis-backed ticket counters so /stats does not COUNT(*) the tickets table on every call."""
+import logging
+import time
+from typing import Optional, Tuple
+import redis
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+TOTAL_TICKETS_KEY = "stats:total_tickets"
+SUCCESSFUL_TICKETS_KEY = "stats:successful_tickets"
+
+# Tickets with confidence above this threshold count as successful
+SUCCESS_CONFIDENCE_THRESHOLD = 0.5
+
+# Counters expire so any drift (e.g. Redis restart, missed increment) self-heals via SQL backfill
+COUNTER_TTL_SECONDS = 3600
+
+# After a Redis error the /stats path skips Redis for this long, so it falls back to SQL
+# right away instead of waiting out the socket timeout on every request
+REDIS_RETRY_AFTER_SECONDS = 30.0
+
+# Add each delta (ARGV[i]) to its counter (KEYS[i]) only if the counter already exists -
+# a missing key must be backfilled from SQL, otherwise INCRBY would silently restart the count
+_INCRBY_IF_EXISTS_SCRIPT = """
+for i, key in ipairs(KEYS) do
+    if redis.call('EXISTS', key) == 1 then
+        redis.call('INCRBY', key, ARGV[i])
+    end
+end
+return nil
+"""
+
+# Global client and script - initialized once and reused (redis-py pools connections internally)
+_redis_client: redis.Redis = None
+_incrby_if_exists = None
+_redis_retry_at = 0.0
+
+
+def get_redis_client() -> redis.Redis:
+    """
+    Get or create the global Redis client used for stats counters.
+    Short timeouts keep /stats responsive (SQL fallback) when Redis is unavailable.
+    
+    Returns:
+        Redis client instance
+    """
+    global _redis_client, _incrby_if_exists
+    
+    if _redis_client is None:
+        _redis_client = redis.Redis(
+            host=get_settings().REDIS_HOST,
+            port=get_settings().REDIS_PORT,
+            db=get_settings().REDIS_DB,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5
+        )
+        _incrby_if_exists = _redis_client.register_script(_INCRBY_IF_EXISTS_SCRIPT)
+    
+    return _redis_client
+
+
+def increment_ticket_counters(total_delta: int, successful_delta: int):
+    """
+    Record a batch of newly committed tickets in the cached counters with one script call.
+    Never raises - a failed increment only means the counters are backfilled later.
+    
+    Args:
+        total_delta: Number of tickets saved
+        successful_delta: Number of those tickets with confidence above the threshold
+    """
+    try:
+        client = get_redis_client()
+        _incrby_if_exists(
+            keys=[TOTAL_TICKETS_KEY, SUCCESSFUL_TICKETS_KEY],
+            args=[total_delta, successful_delta],
+            client=client
+        )
+    except Exception as e:
+        logger.warning(f"Could not update ticket stats counters: {str(e)}")
+
+
+def _redis_circuit_open() -> bool:
+    """Whether a recent Redis error means the /stats path should skip Redis for now."""
+    return time.monotonic() < _redis_retry_at
+
+
+def _open_redis_circuit():
+    """Skip Redis on the /stats path for REDIS_RETRY_AFTER_SECONDS."""
+    global _redis_retry_at
+    _redis_retry_at = time.monotonic() + REDIS_RETRY_AFTER_SECONDS
+
+
+def get_ticket_counters() -> Optional[Tuple[int, int]]:
+    """
+    Read the cached ticket counters.
+    
+    Returns:
+        Tuple of (total_tickets, successful_tickets), or None on cache miss, Redis error
+        or while Redis is skipped after a recent error
+    """
+    if _redis_circuit_open():
+        return None
+    
+    try:
+        total, successful = get_redis_client().mget(TOTAL_TICKETS_KEY, SUCCESSFUL_TICKETS_KEY)
+    except Exception as e:
+        _open_redis_circuit()
+        logger.warning(
+            "Could not read ticket stats counters, skipping Redis for %.0fs: %s", REDIS_RETRY_AFTER_SECONDS, e
+        )
+        return None
+    
+    if total is None or successful is None:
+        return None
+    
+    return int(total), int(successful)
+
+
+def set_ticket_counters(total_tickets: int, successful_tickets: int):
+    """
+    Backfill the cached counters from a SQL count.
+    Each counter is only set if it does not exist (SET NX), so a slow backfill never
+    overwrites counters that another backfill set and increments have since moved on.
+    Never raises - the next /stats call simply falls back to SQL again.
+    
+    Args:
+        total_tickets: Total number of tickets in the database
+        successful_tickets: Number of tickets with confidence above the threshold
+    """
+    if _redis_circuit_open():
+        return
+    
+    try:
+        pipe = get_redis_client().pipeline()
+        pipe.set(TOTAL_TICKETS_KEY, total_tickets, ex=COUNTER_TTL_SECONDS, nx=True)
+        pipe.set(SUCCESSFUL_TICKETS_KEY, successful_tickets, ex=COUNTER_TTL_SECONDS, nx=True)
+        pipe.execute()
+    except Exception as e:
+        _open_redis_circuit()
+        logger.warning("Could not backfill ticket stats counters: %s", e)
+
@@ -1,11 +1,11 @@
 """Celery application configuration."""
 from celery import Celery
-from app.core.config import settings
+from app.core.config import get_settings
 
 celery_app = Celery(
     "smartsupport_worker",
-    broker=settings.CELERY_BROKER_URL,
-    backend=settings.CELERY_RESULT_BACKEND,
+    broker=get_settings().CELERY_BROKER_URL,
+    backend=get_settings().CELERY_RESULT_BACKEND,
     include=["app.worker.tasks"]
 )
 
@@ -1,21 +1,154 @@
 """Celery tasks for async ticket processing."""
-import json
 import logging
+import threading
 import traceback
+from typing import Any, Dict, List, Optional
+import orjson
+from celery.signals import worker_init, worker_process_shutdown
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import scoped_session
+from app.core.config import get_settings
 from app.worker.celery_app import celery_app
 from app.services.model_manager import model_manager
 from app.services.response_generator import generate_response
-from app.services.guardrails import get_guardrail
+from app.services.guardrails import get_guardrail, may_contain_pii
+from app.services.stats_cache import SUCCESS_CONFIDENCE_THRESHOLD, increment_ticket_counters
 from app.core.db import SessionLocal
 from app.models.sql_models import Ticket
 
 logger = logging.getLogger(__name__)
 
-# Initialize PII guardrail globally (so we don't reload the model on every task)
-guardrail = get_guardrail()
+# One session per worker process (thread-local), reused across tasks instead of opened per task
+TaskSession = scoped_session(SessionLocal)
 
+# Per-process buffer of ticket rows waiting for a batched INSERT
+_pending_tickets: List[Dict[str, Any]] = []
+_pending_lock = threading.Lock()
+_flush_lock = threading.Lock()  # Serializes flushes from tasks and the timer thread
+_flush_timer: Optional[threading.Timer] = None
 
-@celery_app.task(bind=True, name="process_ticket_task")
+# Errors worth re-running classification for (network hiccups).
+# Anything else is a permanent failure - retrying would only repeat masking and inference.
+TRANSIENT_ERRORS = (ConnectionError, TimeoutError)
+
+# Errors worth re-running a database write for (locked or unavailable database)
+DB_TRANSIENT_ERRORS = (OperationalError,)
+
+
+@worker_init.connect
+def preload_guardrail(**kwargs):
+    """
+    Build the PII guardrail once in the parent worker process, before the pool forks.
+    Prefork children inherit it copy-on-write instead of each building their own.
+    """
+    get_guardrail()
+    logger.info("PII guardrail preloaded in parent worker process")
+
+
+def _buffer_ticket(ticket_values: Dict[str, Any]):
+    """
+    Queue a processed ticket for insertion.
+    The buffer is flushed when it reaches TICKET_INSERT_BATCH_SIZE, or by a timer
+    TICKET_INSERT_FLUSH_INTERVAL_MS after the first buffered ticket.
+    
+    Args:
+        ticket_values: Column values for one Ticket row
+    """
+    settings = get_settings()
+    global _flush_timer
+    
+    with _pending_lock:
+        _pending_tickets.append(ticket_values)
+        flush_now = len(_pending_tickets) >= settings.TICKET_INSERT_BATCH_SIZE
+        if not flush_now and _flush_timer is None:
+            _flush_timer = threading.Timer(
+                settings.TICKET_INSERT_FLUSH_INTERVAL_MS / 1000,
+                _flush_pending_tickets_on_timer
+            )
+            _flush_timer.daemon = True
+            _flush_timer.start()
+    
+    if flush_now:
+        _flush_pending_tickets()
+
+
+def _insert_tickets(rows: List[Dict[str, Any]]):
+    """
+    Insert ticket rows with a single executemany and update the stats counters.
+    
+    Args:
+        rows: Column values for each Ticket row
+        
+    Raises:
+        Exception: Any database error, after the session is rolled back
+    """
+    db = TaskSession()
+    try:
+        db.execute(insert(Ticket), rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    
+    # One counter update per insert, not per ticket
+    successful = sum(1 for row in rows if row["confidence"] > SUCCESS_CONFIDENCE_THRESHOLD)
+    increment_ticket_counters(len(rows), successful)
+
+
+def _flush_pending_tickets():
+    """
+    Insert all buffered tickets with a single executemany and update the stats counters.
+    Never raises - a failed batch is handed back to the broker as a save_tickets_task,
+    which retries it instead of dropping the rows.
+    """
+    global _flush_timer
+    
+    with _flush_lock:
+        with _pending_lock:
+            if _flush_timer is not None:
+                _flush_timer.cancel()
+                _flush_timer = None
+            batch = _pending_tickets[:]
+            _pending_tickets.clear()
+        
+        if not batch:
+            return
+        
+        try:
+            _insert_tickets(batch)
+            logger.info("✅ %d tickets saved to DB successfully", len(batch))
+        except Exception:
+            logger.exception("❌ DB Save Error for %d buffered tickets, re-enqueuing them", len(batch))
+            try:
+                save_tickets_task.apply_async(args=[batch])
+            except Exception:
+                logger.exception("❌ Could not re-enqueue %d tickets - they are lost", len(batch))
+
+
+def _flush_pending_tickets_on_timer():
+    """Timer callback: flush the buffer, then drop the timer thread's session."""
+    try:
+        _flush_pending_tickets()
+    finally:
+        TaskSession.remove()
+
+
+@worker_process_shutdown.connect
+def close_task_session(**kwargs):
+    """Flush buffered tickets and close the worker process's database session on shutdown."""
+    _flush_pending_tickets()
+    TaskSession.remove()
+
+
+@celery_app.task(
+    bind=True,
+    name="process_ticket_task",
+    autoretry_for=TRANSIENT_ERRORS,
+    max_retries=3,
+    retry_backoff=60,  # Backoff caps of 60s, 120s, 240s - retry_jitter picks each delay in [0, cap]
+    retry_jitter=True
+)
 def process_ticket_task(self, text: str) -> dict:
     """
     Async Celery task to process ticket classification.
@@ -27,72 +160,53 @@ def process_ticket_task(self, text: str) -> dict:
         Dictionary with analysis results including language, intent, confidence, sanitized_text, and response_text
     """
     task_id = self.request.id
-    db = SessionLocal()
     
     try:
-        # Mask PII using Presidio guardrail BEFORE processing or saving
-        logger.info(f"Task {task_id} - Masking PII...")
-        masked_text = guardrail.anonymize(text)
-        logger.info(f"Task {task_id} - PII masking complete")
+        # Mask PII BEFORE processing or saving with the guardrail's pre-compiled regex fast path
+        # (Presidio is only used for correctness checks and never loaded with PII_FAST_ONLY).
+        # Texts without a digit, "@" or ":" cannot contain PII - skip the guardrail entirely
+        if may_contain_pii(text):
+            logger.info("Task %s - Masking PII...", task_id)
+            masked_text = get_guardrail().anonymize(text)
+            logger.info("Task %s - PII masking complete", task_id)
+        else:
+            masked_text = text
+            logger.debug("Task %s - No PII hints, skipping masking", task_id)
         
-        logger.info(f"Task {task_id} - Starting prediction...")
-        result = model_manager.predict(masked_text)
+        logger.info("Task %s - Starting prediction...", task_id)
+        prediction = model_manager.predict(masked_text)
         
         # Extract prediction data
-        intent = result.get("intent", "unknown")
-        confidence = result.get("confidence", 0.0)
-        language = result.get("language", "en")
-        translated_text = result.get("translated_text", None)
-        predictions = result.get("predictions", [])  # Get top 3 predictions list
+        intent = prediction.intent
+        confidence = prediction.confidence
+        language = prediction.language
+        translated_text = prediction.translated_text
+        predictions = prediction.predictions  # Top 3 predictions list
         
-        logger.info(f"Task {task_id} - Prediction complete: intent={intent}, confidence={confidence:.3f}, language={language}")
+        logger.info(
+            "Task %s - Prediction complete: intent=%s, confidence=%.3f, language=%s",
+            task_id, intent, confidence, language
+        )
         if translated_text:
-            logger.info(f"Task {task_id} - Translation: {translated_text[:50]}...")
+            logger.info("Task %s - Translation: %.50s...", task_id, translated_text)
         
-        # Convert predictions list to JSON string for storage
-        prediction_details_json = json.dumps(predictions) if predictions else None
-        logger.debug(f"Task {task_id} - Top 3 predictions: {prediction_details_json}")
+        # Convert predictions list to JSON string for storage (the column stays TEXT on SQLite)
+        prediction_details_json = orjson.dumps(predictions).decode() if predictions else None
+        logger.debug("Task %s - Top 3 predictions: %s", task_id, prediction_details_json)
         
         # Generate varied response based on intent and language
         response_text = generate_response(intent, language)
-        logger.info(f"Task {task_id} - Generated response: {response_text[:50]}...")
+        logger.info("Task %s - Generated response: %.50s...", task_id, response_text)
+        
+        # Celery results must be JSON - convert at the return boundary
+        result = prediction.to_dict()
         
         # Add masked text and response to result
         result["sanitized_text"] = masked_text  # Use masked text, not original
         result["response_text"] = response_text
         result["prediction_details"] = prediction_details_json  # Add JSON string to result
         
-        logger.info(f"Task {task_id} - SAVING TO DB...")
-        print(f"Task {task_id} - SAVING TO DB...")
-        
-        try:
-            ticket_entry = Ticket(
-                text=masked_text,  # Save masked text to database (PII already anonymized)
-                sanitized_text=masked_text,  # Also store in sanitized_text column for API response
-                intent=intent,
-                confidence=confidence,
-                language=language,
-                response_text=response_text,
-                translated_text=translated_text,  # Store the English translation
-                prediction_details=prediction_details_json  # Store top 3 predictions as JSON string
-            )
-            
-            db.add(ticket_entry)
-            db.commit()
-            db.refresh(ticket_entry)
-            
-            logger.info(f"✅ Ticket {task_id} saved to DB successfully with ID: {ticket_entry.id}")
-            print(f"✅ Ticket {task_id} saved to DB successfully with ID: {ticket_entry.id}")
-            
-        except Exception as db_error:
-            db.rollback()
-            error_msg = f"❌ DB Save Error for task {task_id}: {str(db_error)}"
-            logger.error(error_msg)
-            print(error_msg)
-            logger.error(f"Full DB error traceback:\n{traceback.format_exc()}")
-            # Don't fail the task if DB save fails, just log it
-        
-        logger.info(f"Task {task_id} completed successfully")
+        logger.info("Task %s completed successfully", task_id)
         return result
         
     except Exception as e:
@@ -102,8 +216,62 @@ def process_ticket_task(self, text: str) -> dict:
             f"Task {task_id} failed with error: {str(e)}\n"
             f"Full traceback:\n{error_traceback}"
         )
-        # Retry logic can be added here if needed
-        raise self.retry(exc=e, countdown=60, max_retries=3)
-    finally:
-        db.close()
-        logger.debug(f"Task {task_id} - Database session closed")
+        # TRANSIENT_ERRORS are retried by autoretry_for, everything else fails the task
+        raise
+
+
+@celery_app.task(name="persist_ticket_task", ignore_result=True)
+def persist_ticket_task(result: dict):
+    """
+    Save a classified ticket to the database.
+    Linked after process_ticket_task, so the classification result is published
+    before any database work happens.
+    
+    Args:
+        result: Return value of process_ticket_task
+    """
+    # Buffered and written with other tickets in one multi-row INSERT
+    _buffer_ticket({
+        "text": result["sanitized_text"],  # Save masked text to database (PII already anonymized)
+        "sanitized_text": result["sanitized_text"],  # Also store in sanitized_text column for API response
+        "intent": result.get("intent", "unknown"),
+        "confidence": result.get("confidence", 0.0),
+        "language": result.get("language", "en"),
+        "response_text": result["response_text"],
+        "translated_text": result.get("translated_text"),  # Store the English translation
+        "prediction_details": result["prediction_details"]  # Store top 3 predictions as JSON string
+    })
+
+
+@celery_app.task(
+    bind=True,
+    name="save_tickets_task",
+    ignore_result=True,
+    acks_late=True,  # The message is only acked once the rows are committed
+    autoretry_for=DB_TRANSIENT_ERRORS,
+    max_retries=5,
+    retry_backoff=5,  # Backoff caps of 5s, 10s, 20s, 40s, 80s - retry_jitter picks each delay in [0, cap]
+    retry_jitter=True
+)
+def save_tickets_task(self, rows: List[Dict[str, Any]]):
+    """
+    Insert ticket rows whose buffered flush failed.
+    Transient errors are retried by autoretry_for. On any other error the batch is
+    split into one task per row, so a bad row only loses itself, not the whole batch.
+    
+    Args:
+        rows: Column values for each Ticket row
+    """
+    try:
+        _insert_tickets(rows)
+    except DB_TRANSIENT_ERRORS:
+        raise
+    except Exception:
+        if len(rows) == 1:
+            raise
+        logger.warning("Batch of %d tickets failed permanently, retrying row by row", len(rows))
+        for row in rows:
+            save_tickets_task.apply_async(args=[[row]])
+        return
+    
+    logger.info("✅ %d re-enqueued tickets saved to DB successfully", len(rows))
@@ -2,12 +2,33 @@
 Locust load testing file for SmartSupport Backend API.
 
 Usage:
-    locust -f locustfile.py --host=http://localhost:8000
+    SMARTSUPPORT_API_KEY=your-api-key locust -f locustfile.py --host=http://localhost:8000
     Then open http://localhost:8089 in your browser to start the test.
+
+Using every CPU core (one gevent process only uses one):
+    locust -f locustfile.py --host=http://localhost:8000 --master
+    locust -f locustfile.py --worker    # once per core, on this or other machines
+    Payloads and headers are built at module scope, so each worker process
+    builds them once. The optional ticket token bucket is per process - divide
+    LOCUST_TICKET_REQUESTS_PER_MINUTE by the number of workers.
 """
+import os
 import random
-from locust import HttpUser, task, between
-from app.core.config import settings
+import threading
+import time
+import gevent
+import orjson
+from locust import FastHttpUser, constant_throughput, events, task
+
+# Read from the environment directly - importing app settings would pull the
+# whole backend (pydantic settings, torch, transformers) into every Locust worker
+API_KEY = os.environ.get("SMARTSUPPORT_API_KEY") or os.environ.get("API_KEY", "CHANGE_ME_IN_PRODUCTION")
+
+# Request headers built once and shared by every simulated user
+HEADERS = {
+    "X-API-Key": API_KEY,
+    "Content-Type": "application/json"
+}
 
 SUPPORT_TEXTS = [
     "I lost my card, please help me block it immediately.",
@@ -17,19 +38,134 @@ SUPPORT_TEXTS = [
     "My card was stolen, I need to report it urgently.",
 ]
 
+# Request bodies serialized once at import - the task loop only picks one
+PRE_ENCODED = tuple(orjson.dumps({"text": text}) for text in SUPPORT_TEXTS)
+_PAYLOAD_COUNT = len(PRE_ENCODED)
+_randrange = random.randrange
+
+# Ticket texts are buffered across all users of this process and sent to the batch
+# endpoint as soon as BATCH_SIZE texts are waiting, or by a timer greenlet
+# BATCH_MAX_WAIT_S after the first text of a batch was buffered.
+# Expected batch size: each user runs 5 tasks/s and 1 in 5 is create_ticket, so N users
+# buffer ~N texts/s - about N / 2 texts per timer flush, full 16-text batches from ~32 users.
+BATCH_SIZE = 16
+BATCH_MAX_WAIT_S = 0.5
+_ticket_batch = []
+_batch_timer = None
+
+BATCH_PATH = "/api/v1/tickets/batch"
+
+# Optional cap on ticket POSTs per minute across all users of this Locust process
+# (0, the default, disables it). Off by default so a run measures API throughput,
+# not this client's limiter - set it to stay under the API's per-IP ticket limit.
+TICKET_REQUESTS_PER_MINUTE = float(os.environ.get("LOCUST_TICKET_REQUESTS_PER_MINUTE", "0"))
 
-class SmartSupportUser(HttpUser):
-    """Locust user class for load testing SmartSupport Backend API."""
+
+class TokenBucket:
+    """Process-wide token bucket. Never blocks - callers skip the request when it is empty."""
     
-    wait_time = between(1, 3)
+    def __init__(self, rate_per_second, capacity=1.0):
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def try_acquire(self):
+        """
+        Take one token if the bucket has one.
+        
+        Returns:
+            True if a token was taken, False if the bucket is empty
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate_per_second)
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+TICKET_BUCKET = TokenBucket(TICKET_REQUESTS_PER_MINUTE / 60) if TICKET_REQUESTS_PER_MINUTE > 0 else None
+
+
+def acquire_ticket_slot(path):
+    """
+    Check the optional ticket token bucket before a ticket POST.
+    A denied POST is reported as a "<path> [skipped]" request so the Locust
+    statistics show how much ticket traffic the client-side cap held back.
+    
+    Returns:
+        True if the POST may be sent, False if it was skipped
+    """
+    if TICKET_BUCKET is None or TICKET_BUCKET.try_acquire():
+        return True
+    events.request.fire(
+        request_type="POST",
+        name=f"{path} [skipped]",
+        response_time=0,
+        response_length=0,
+        response=None,
+        context={},
+        exception=None
+    )
+    return False
+
+
+class SmartSupportUser(FastHttpUser):
+    """
+    Locust user class for load testing SmartSupport Backend API.
+    Uses geventhttpclient (FastHttpUser) instead of python-requests so the
+    load generator is not the bottleneck.
+    """
+    
+    # Each user runs 5 tasks per second regardless of response time -
+    # size --users as target requests per second / 5
+    wait_time = constant_throughput(5)
+    network_timeout = 10.0
+    connection_timeout = 10.0
     
     def on_start(self):
-        """Set up authentication headers when user starts."""
-        self.api_key = settings.API_KEY
-        self.headers = {
-            "X-API-Key": self.api_key,
-            "Content-Type": "application/json"
-        }
+        """Set up authentication headers and bind the post method when user starts."""
+        self.headers = HEADERS
+        self._post = self.client.post
+    
+    def on_stop(self):
+        """Send any tickets still buffered when the user stops."""
+        self.flush_tickets()
+    
+    def post_tickets(self, path, body):
+        """POST a ticket request body, counting rate-limited (429) responses as expected."""
+        with self._post(path, data=body, headers=self.headers, catch_response=True) as response:
+            if response.status_code == 429:
+                # The API rate limits ticket requests per client IP - being throttled is not an error
+                response.success()
+    
+    def flush_tickets(self):
+        """
+        POST the buffered ticket texts to the batch endpoint in one request.
+        The buffer is only drained once the token bucket allows the POST, so a
+        skipped flush keeps its texts for the next attempt.
+        
+        Returns:
+            True if the buffer was sent (or empty), False if the POST was skipped
+        """
+        global _ticket_batch, _batch_timer
+        
+        timer, _batch_timer = _batch_timer, None
+        if timer is not None and timer is not gevent.getcurrent():
+            timer.kill(block=False)
+        
+        if not _ticket_batch:
+            return True
+        if not acquire_ticket_slot(BATCH_PATH):
+            return False
+        
+        batch, _ticket_batch = _ticket_batch, []
+        self.post_tickets(BATCH_PATH, orjson.dumps({"texts": batch}))
+        return True
     
     @task(3)
     def health_check(self):
@@ -38,10 +174,21 @@ class SmartSupportUser(HttpUser):
     
     @task(1)
     def create_ticket(self):
-        """Create a support ticket - simulates actual user behavior."""
-        text = random.choice(SUPPORT_TEXTS)
-        self.client.post(
-            "/api/v1/tickets",
-            json={"text": text},
-            headers=self.headers
-        )
\ No newline at end of file
+        """Create a support ticket - simulates actual user behavior (sent in batches)."""
+        global _batch_timer
+        
+        # A full buffer whose flush was skipped holds this text back - the skip is already reported
+        if len(_ticket_batch) >= BATCH_SIZE and not self.flush_tickets():
+            return
+        
+        _ticket_batch.append(SUPPORT_TEXTS[_randrange(_PAYLOAD_COUNT)])
+        if len(_ticket_batch) >= BATCH_SIZE:
+            self.flush_tickets()
+        elif _batch_timer is None:
+            _batch_timer = gevent.spawn_later(BATCH_MAX_WAIT_S, self.flush_tickets)
+    
+    @task(1)
+    def create_single_ticket(self):
+        """Create one support ticket through the single-ticket endpoint."""
+        if acquire_ticket_slot("/api/v1/tickets"):
+            self.post_tickets("/api/v1/tickets", PRE_ENCODED[_randrange(_PAYLOAD_COUNT)])
\ No newline at end of file
@@ -0,0 +1,14 @@
+"""Shared pytest fixtures."""
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def client():
+    """
+    Test client shared by the whole session.
+    Not entered as a context manager, so the app lifespan (database init,
+    model loading) never runs - API tests mock the work behind the endpoints.
+    """
+    from app.main import app
+    return TestClient(app)
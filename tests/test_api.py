@@ -1,15 +1,92 @@
 """Unit tests for FastAPI endpoints."""
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 import pytest
-from unittest.mock import patch, MagicMock
-from fastapi.testclient import TestClient
-from app.main import app
-from app.core.config import settings
+import redis
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import app.main as main
+from app.core.config import get_settings
+from app.core.db import Base, get_read_db
+from app.models.sql_models import Ticket
+from app.services import stats_cache
 
-# Create test client
-client = TestClient(app)
+settings = get_settings()
 
+# Stub Celery task returned by the fake enqueue - built once for the module
+_FAKE_TASK = MagicMock(id="test-task-id-123")
 
-def test_read_root():
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiter(client):
+    """Clear rate limit counters so each test starts with a full allowance."""
+    client.app.state.limiter.reset()
+
+
+@pytest.fixture
+def fake_celery(monkeypatch):
+    """Replace the Celery enqueue with a stub returning a fixed task, so no broker is needed."""
+    _FAKE_TASK.reset_mock()
+    monkeypatch.setattr("app.main.process_ticket_task.apply_async", lambda *args, **kwargs: _FAKE_TASK)
+    return _FAKE_TASK
+
+
+@pytest.fixture
+def stats_db(client):
+    """Serve /stats from an in-memory database holding 3 tickets, 2 of them successful."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    with session_factory() as db:
+        db.add_all(
+            Ticket(text=f"ticket {i}", intent="card_arrival", confidence=confidence, language="en")
+            for i, confidence in enumerate([0.9, 0.8, 0.2])
+        )
+        db.commit()
+    
+    def override_get_read_db():
+        with session_factory() as db:
+            yield db
+    
+    client.app.dependency_overrides[get_read_db] = override_get_read_db
+    yield
+    client.app.dependency_overrides.pop(get_read_db, None)
+
+
+@pytest.fixture
+def task_results(monkeypatch):
+    """Serve task metadata from a dict instead of the result backend and record each lookup."""
+    metas = {}
+    lookups = []
+    
+    class FakeAsyncResult:
+        def __init__(self, task_id, app=None):
+            self.task_id = task_id
+        
+        def _get_task_meta(self):
+            lookups.append(self.task_id)
+            return metas[self.task_id]
+    
+    monkeypatch.setattr(main, "AsyncResult", FakeAsyncResult)
+    monkeypatch.setattr(main, "_terminal_cache", OrderedDict())
+    return metas, lookups
+
+
+def get_status(client, task_id):
+    """GET the status of a task with a valid API key."""
+    return client.get(
+        f"{settings.API_V1_PREFIX}/tickets/status/{task_id}",
+        headers={"X-API-Key": settings.API_KEY}
+    )
+
+
+def test_read_root(client):
     """Test that GET / returns 200 and welcome message."""
     response = client.get("/")
     
@@ -22,84 +99,219 @@ def test_read_root():
     assert "SmartSupport" in data["message"]
 
 
-def test_create_ticket():
-    """Test POST /api/v1/tickets endpoint."""
-    # Mock Celery task to avoid actual async processing
-    mock_task = MagicMock()
-    mock_task.id = "test-task-id-123"
+@pytest.mark.parametrize("api_key, expected_status", [
+    (settings.API_KEY, 202),
+    (None, 401),  # Missing API key
+    ("invalid-key", 403),
+])
+def test_create_ticket_auth(client, fake_celery, api_key, expected_status):
+    """Test POST /api/v1/tickets with a valid, missing and invalid API key."""
+    headers = {"X-API-Key": api_key} if api_key is not None else {}
     
-    with patch('app.main.process_ticket_task.delay', return_value=mock_task):
-        payload = {"text": "My internet connection is lost, help!"}
-        headers = {"X-API-Key": settings.API_KEY}
-        
-        response = client.post(
-            f"{settings.API_V1_PREFIX}/tickets",
-            json=payload,
-            headers=headers
-        )
-        
-        assert response.status_code == 202
-        
-        data = response.json()
-        assert "task_id" in data
-        assert "status" in data
-        assert "message" in data
-        assert data["task_id"] == "test-task-id-123"
+    response = client.post(
+        f"{settings.API_V1_PREFIX}/tickets",
+        json={"text": "My internet connection is lost, help!"},
+        headers=headers
+    )
+    
+    assert response.status_code == expected_status
+    data = response.json()
+    if expected_status == 202:
+        assert data["task_id"] == fake_celery.id
         assert data["status"] == "PENDING"
+        assert "message" in data
+    else:
+        assert "detail" in data
 
 
-def test_create_ticket_missing_api_key():
-    """Test that POST /api/v1/tickets requires API key."""
-    payload = {"text": "Test ticket"}
+def test_create_ticket_batch(client, monkeypatch):
+    """Test POST /api/v1/tickets/batch enqueues one task per text."""
+    mock_group = MagicMock()
+    mock_group.return_value.apply_async.return_value.results = [MagicMock(id="task-1"), MagicMock(id="task-2")]
+    monkeypatch.setattr("app.main.group", mock_group)
     
     response = client.post(
-        f"{settings.API_V1_PREFIX}/tickets",
-        json=payload
-        # No API key header
+        f"{settings.API_V1_PREFIX}/tickets/batch",
+        json={"texts": ["I lost my card", "Mail me at john.doe@example.com"]},
+        headers={"X-API-Key": settings.API_KEY}
     )
     
-    assert response.status_code == 401
+    assert response.status_code == 202
     data = response.json()
-    assert "detail" in data
+    assert data["task_ids"] == ["task-1", "task-2"]
+    assert data["status"] == "PENDING"
+    assert len(list(mock_group.call_args.args[0])) == 2
 
 
-def test_create_ticket_invalid_api_key():
-    """Test that POST /api/v1/tickets rejects invalid API key."""
-    payload = {"text": "Test ticket"}
-    headers = {"X-API-Key": "invalid-key"}
+def test_create_ticket_batch_rejects_oversized_batch(client, monkeypatch):
+    """Test that batches above TICKET_BATCH_MAX_SIZE are rejected before anything is enqueued."""
+    mock_group = MagicMock()
+    monkeypatch.setattr("app.main.group", mock_group)
     
     response = client.post(
-        f"{settings.API_V1_PREFIX}/tickets",
-        json=payload,
-        headers=headers
+        f"{settings.API_V1_PREFIX}/tickets/batch",
+        json={"texts": ["I lost my card"] * (settings.TICKET_BATCH_MAX_SIZE + 1)},
+        headers={"X-API-Key": settings.API_KEY}
     )
     
-    assert response.status_code == 403
-    data = response.json()
-    assert "detail" in data
+    assert response.status_code == 422
+    mock_group.assert_not_called()
 
 
-def test_rate_limit():
-    """Test that rate limiting works (5 requests per minute)."""
-    client = TestClient(app)
-    limit_hit = False
+def test_batch_texts_count_against_ticket_rate_limit(client, fake_celery, monkeypatch):
+    """Test that each text in a batch uses up one ticket of the shared per-IP rate limit."""
+    mock_group = MagicMock()
+    mock_group.return_value.apply_async.return_value.results = [MagicMock(id=f"task-{i}") for i in range(4)]
+    monkeypatch.setattr("app.main.group", mock_group)
+    headers = {"X-API-Key": settings.API_KEY}
     
-    for i in range(10):
-        response = client.post(
-            "/api/v1/tickets",
+    batch = client.post(
+        f"{settings.API_V1_PREFIX}/tickets/batch",
+        json={"texts": ["I lost my card"] * 4},
+        headers=headers
+    )
+    single_statuses = [
+        client.post(f"{settings.API_V1_PREFIX}/tickets", json={"text": "I lost my card"}, headers=headers).status_code
+        for _ in range(2)
+    ]
+    
+    assert batch.status_code == 202
+    assert single_statuses == [202, 429]
+
+
+def test_rate_limit(client, fake_celery):
+    """Test that rate limiting holds under a concurrent burst (5 requests per minute)."""
+    def post_ticket(i):
+        return client.post(
+            f"{settings.API_V1_PREFIX}/tickets",
             json={"text": f"Burn rate limit {i}"},
             headers={"X-API-Key": settings.API_KEY}
-        )
-        
-        if response.status_code == 429:
-            limit_hit = True
-            break
-        else:
-            assert response.status_code in [200, 202], f"Request {i} failed with {response.status_code}"
+        ).status_code
+    
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        status_codes = list(executor.map(post_ticket, range(6)))
+    
+    assert sorted(status_codes) == [202] * 5 + [429], f"Unexpected status codes: {status_codes}"
+
+
+def test_stats_served_from_counters(client, stats_db, monkeypatch):
+    """Test that a counter hit is returned as-is without touching the database."""
+    backfill = MagicMock()
+    monkeypatch.setattr("app.main.get_ticket_counters", lambda: (10, 4))
+    monkeypatch.setattr("app.main.set_ticket_counters", backfill)
+    
+    response = client.get(f"{settings.API_V1_PREFIX}/stats", headers={"X-API-Key": settings.API_KEY})
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_tickets"] == 10
+    assert data["success_rate"] == pytest.approx(0.4)
+    backfill.assert_not_called()
+
+
+def test_stats_counter_miss_backfills_from_db(client, stats_db, monkeypatch):
+    """Test that a counter miss counts the tickets in SQL and backfills the counters."""
+    backfill = MagicMock()
+    monkeypatch.setattr("app.main.get_ticket_counters", lambda: None)
+    monkeypatch.setattr("app.main.set_ticket_counters", backfill)
+    
+    response = client.get(f"{settings.API_V1_PREFIX}/stats", headers={"X-API-Key": settings.API_KEY})
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_tickets"] == 3
+    assert data["success_rate"] == pytest.approx(2 / 3)
+    backfill.assert_called_once_with(3, 2)
+
+
+def test_stats_falls_back_to_db_when_redis_unavailable(client, stats_db, monkeypatch):
+    """Test that /stats answers from SQL when Redis is down and stops retrying it on every call."""
+    attempts = []
+    
+    def unavailable():
+        attempts.append(1)
+        raise redis.ConnectionError("Redis is down")
+    
+    monkeypatch.setattr(stats_cache, "get_redis_client", unavailable)
+    monkeypatch.setattr(stats_cache, "_redis_retry_at", 0.0)
+    
+    responses = [
+        client.get(f"{settings.API_V1_PREFIX}/stats", headers={"X-API-Key": settings.API_KEY})
+        for _ in range(2)
+    ]
+    
+    for response in responses:
+        assert response.status_code == 200
+        assert response.json()["total_tickets"] == 3
+        assert response.json()["success_rate"] == pytest.approx(2 / 3)
+    assert len(attempts) == 1
+
+
+def test_stats_backfill_never_overwrites_existing_counters(client, stats_db, monkeypatch):
+    """Test that the SQL backfill only sets counters that do not exist yet (SET NX)."""
+    pipeline = MagicMock()
+    redis_client = MagicMock()
+    redis_client.mget.return_value = [None, None]
+    redis_client.pipeline.return_value = pipeline
+    monkeypatch.setattr(stats_cache, "get_redis_client", lambda: redis_client)
+    monkeypatch.setattr(stats_cache, "_redis_retry_at", 0.0)
+    
+    response = client.get(f"{settings.API_V1_PREFIX}/stats", headers={"X-API-Key": settings.API_KEY})
+    
+    assert response.status_code == 200
+    assert [call.args for call in pipeline.set.call_args_list] == [
+        (stats_cache.TOTAL_TICKETS_KEY, 3),
+        (stats_cache.SUCCESSFUL_TICKETS_KEY, 2),
+    ]
+    assert all(call.kwargs["nx"] for call in pipeline.set.call_args_list)
+    pipeline.execute.assert_called_once()
+
+
+@pytest.mark.parametrize("meta, expected_status", [
+    ({"status": "SUCCESS", "result": {"intent": "card_arrival", "confidence": 0.9, "language": "en"}}, "SUCCESS"),
+    ({"status": "FAILURE", "result": "model crashed"}, "FAILURE"),
+])
+def test_terminal_task_status_is_cached(client, task_results, meta, expected_status):
+    """Test that SUCCESS and FAILURE results are served from the cache on repeat polls."""
+    metas, lookups = task_results
+    metas["done"] = meta
+    
+    first = get_status(client, "done")
+    second = get_status(client, "done")
+    
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert first.json()["status"] == expected_status
+    assert lookups == ["done"]
+
+
+def test_terminal_cache_evicts_least_recently_used(client, task_results, monkeypatch):
+    """Test that the terminal cache drops its oldest entry once it is over capacity."""
+    metas, lookups = task_results
+    monkeypatch.setattr(main, "_TERMINAL_CACHE_MAX_SIZE", 2)
+    for task_id in ("a", "b", "c"):
+        metas[task_id] = {"status": "FAILURE", "result": "model crashed"}
+        get_status(client, task_id)
+    
+    assert list(main._terminal_cache) == ["b", "c"]
+    get_status(client, "a")
+    assert lookups == ["a", "b", "c", "a"]
+
+
+@pytest.mark.parametrize("celery_state", ["PENDING", "STARTED"])
+def test_in_progress_task_status_is_not_cached(client, task_results, celery_state):
+    """Test that PENDING and STARTED results are looked up on every poll."""
+    metas, lookups = task_results
+    metas["running"] = {"status": celery_state, "result": None}
+    
+    get_status(client, "running")
+    get_status(client, "running")
+    
+    assert lookups == ["running", "running"]
+    assert "running" not in main._terminal_cache
 
-    assert limit_hit, "Rate limit was never triggered! System allowed too many requests."
 
-def test_health_check():
+def test_health_check(client):
     """Test GET /health endpoint."""
     response = client.get("/health")
     
@@ -0,0 +1,119 @@
+"""Unit tests for database engines, sessions and schema migrations."""
+import sqlite3
+from unittest.mock import MagicMock
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app.core import db
+from app.models.sql_models import Ticket
+
+# Indexes added by the version 2 migration
+MIGRATION_INDEXES = ("ix_tickets_confidence", "ix_tickets_created_at", "ix_tickets_created_confidence")
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Point the engines and session factories at a database file that does not exist yet."""
+    database_path = tmp_path / "smartsupport.db"
+    write_engine = db.create_write_engine(database_path)
+    read_engine = db.create_read_engine(database_path)
+    monkeypatch.setattr(db, "engine", write_engine)
+    monkeypatch.setattr(db, "SessionLocal", sessionmaker(autoflush=False, bind=write_engine))
+    monkeypatch.setattr(db, "ReadSessionLocal", sessionmaker(autoflush=False, bind=read_engine))
+    yield database_path
+    
+    write_engine.dispose()
+    read_engine.dispose()
+
+
+def test_read_engine_creates_missing_database_file(temp_db):
+    """Test that a read before any write opens an empty database instead of failing."""
+    assert not temp_db.exists()
+    
+    read_db = next(db.get_read_db())
+    assert read_db.execute(text("SELECT 1")).scalar() == 1
+    assert temp_db.exists()
+
+
+def test_read_session_rejects_writes(temp_db):
+    """Test that writes through get_read_db fail on the query_only connection."""
+    db.init_db()
+    read_db = next(db.get_read_db())
+    
+    read_db.add(Ticket(text="I lost my card", intent="lost_or_stolen_card", confidence=0.9, language="en"))
+    with pytest.raises(OperationalError, match="readonly"):
+        read_db.commit()
+
+
+def test_committed_writes_are_visible_to_read_session(temp_db):
+    """Test that tickets committed through get_write_db are read back through get_read_db."""
+    db.init_db()
+    write_db = next(db.get_write_db())
+    write_db.add(Ticket(text="I lost my card", intent="lost_or_stolen_card", confidence=0.9, language="en"))
+    write_db.commit()
+    
+    read_db = next(db.get_read_db())
+    assert read_db.query(Ticket.intent).scalar() == "lost_or_stolen_card"
+
+
+def schema_state(database_path):
+    """Return the user_version, ticket columns and ticket index names of a database file."""
+    conn = sqlite3.connect(database_path)
+    try:
+        user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(tickets)")}
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(tickets)")}
+    finally:
+        conn.close()
+    return user_version, columns, indexes
+
+
+def test_init_db_creates_fresh_schema(temp_db):
+    """Test that a fresh database ends at the current schema version with its indexes."""
+    db.init_db()
+    
+    user_version, columns, indexes = schema_state(temp_db)
+    assert user_version == db.SCHEMA_VERSION
+    assert {"sanitized_text", "prediction_details"} <= columns
+    assert set(MIGRATION_INDEXES) <= indexes
+
+
+def test_init_db_migrates_legacy_table(temp_db):
+    """Test that a table created before the new columns and indexes is migrated."""
+    conn = sqlite3.connect(temp_db)
+    conn.execute(
+        "CREATE TABLE tickets (id INTEGER PRIMARY KEY, text TEXT NOT NULL, intent VARCHAR(255) NOT NULL, "
+        "confidence FLOAT NOT NULL, language VARCHAR(10) NOT NULL, response_text TEXT, "
+        "translated_text TEXT, created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO tickets (text, intent, confidence, language) VALUES ('I lost my card', 'lost_or_stolen_card', 0.9, 'en')"
+    )
+    conn.commit()
+    conn.close()
+    
+    db.init_db()
+    
+    user_version, columns, indexes = schema_state(temp_db)
+    assert user_version == db.SCHEMA_VERSION
+    assert {"sanitized_text", "prediction_details"} <= columns
+    assert set(MIGRATION_INDEXES) <= indexes
+    assert next(db.get_read_db()).query(Ticket).count() == 1
+
+
+def test_init_db_is_a_noop_when_schema_is_current(temp_db, monkeypatch):
+    """Test that a second init_db call skips creating tables and migrating."""
+    db.init_db()
+    
+    create_all = MagicMock()
+    monkeypatch.setattr(db.Base.metadata, "create_all", create_all)
+    statements = []
+    event.listen(db.engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    
+    db.init_db()
+    
+    create_all.assert_not_called()
+    assert any("user_version" in statement for statement in statements)
+    assert not [statement for statement in statements if "ALTER" in statement or "CREATE" in statement]
+    assert schema_state(temp_db)[0] == db.SCHEMA_VERSION
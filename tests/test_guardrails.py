@@ -0,0 +1,144 @@
+"""Unit tests for the PII guardrail."""
+import pytest
+from app.core.config import get_settings
+from app.services.guardrails import PIIGuardrail, get_guardrail, is_valid_tckn, may_contain_pii
+
+settings = get_settings()
+
+PII_SAMPLES = [
+    ("Mail me at john.doe@example.com please", "Mail me at <EMAIL_ADDRESS> please"),
+    ("My card is 4111 1111 1111 1111", "My card is <CREDIT_CARD>"),
+    ("Server ip is 192.168.1.1 now", "Server ip is <IP_ADDRESS> now"),
+    ("btc wallet 1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN2", "btc wallet <CRYPTO>"),
+    ("Call me at +1 415-555-2671", "Call me at <PHONE_NUMBER>"),
+]
+
+# Number-like text that is not PII and must survive masking unchanged
+NON_PII_SAMPLES = [
+    "Transfer 10.000.000 TL to my savings",  # Amount
+    "Order 12345678 has not arrived",  # Order ID
+    "Reference 20240115 on the statement",  # Date-like reference
+    "Charged on 2024-01-15 and again on 15.01.2024",  # Dates
+    "Ticket 2024 123 4567 is still open",  # Grouped reference number
+    "Code 123-456-789 was rejected",
+    "IBAN fragment TR33 0006 1005 1978 6457 8413 26",
+]
+
+
+@pytest.fixture(scope="module")
+def presidio_guardrail():
+    """Guardrail with the Presidio analyzer loaded (PII_FAST_ONLY disabled)."""
+    fast_only = settings.PII_FAST_ONLY
+    settings.PII_FAST_ONLY = False
+    try:
+        return PIIGuardrail()
+    finally:
+        settings.PII_FAST_ONLY = fast_only
+
+
+@pytest.mark.parametrize("text, expected", PII_SAMPLES)
+def test_anonymize_masks_pii(text, expected):
+    """Test that the fast path masks each supported entity type."""
+    assert get_guardrail().anonymize(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", PII_SAMPLES)
+def test_anonymize_matches_presidio(presidio_guardrail, text, expected):
+    """Test that the fast path agrees with the full Presidio pipeline."""
+    assert presidio_guardrail.anonymize(text) == presidio_guardrail.anonymize(text, use_presidio=True)
+
+
+@pytest.mark.parametrize("text", NON_PII_SAMPLES)
+def test_anonymize_keeps_non_pii_numbers(presidio_guardrail, text):
+    """Test that amounts, dates, order IDs and IBAN fragments are left alone, like Presidio does."""
+    assert presidio_guardrail.anonymize(text) == text
+    assert presidio_guardrail.anonymize(text, use_presidio=True) == text
+
+
+@pytest.mark.parametrize("text", [
+    "Ara beni +90 532 123 45 67",
+    "Numaram 0532 123 45 67",
+    "Call (212) 555-0147",
+])
+def test_anonymize_masks_turkish_and_local_phone_numbers(text):
+    """Test that valid international, Turkish and local phone formats are still masked."""
+    assert "<PHONE_NUMBER>" in get_guardrail().anonymize(text)
+
+
+def test_anonymize_without_pii():
+    """Test that text without PII is returned unchanged."""
+    text = "I lost my card, please help me block it immediately."
+    assert get_guardrail().anonymize(text) == text
+
+
+def test_anonymize_invalid_credit_card_not_masked():
+    """Test that numbers failing the Luhn checksum are not masked as credit cards."""
+    masked = get_guardrail().anonymize("Reference 4111 1111 1111 1112")
+    assert "<CREDIT_CARD>" not in masked
+
+
+def test_is_valid_tckn():
+    """Test the TCKN checksum rules."""
+    assert is_valid_tckn("10000000146")
+    assert not is_valid_tckn("10000000147")  # Wrong 11th digit
+    assert not is_valid_tckn("12345678901")  # Wrong 10th digit
+    assert not is_valid_tckn("01234567890")  # Leading zero
+
+
+def test_anonymize_masks_only_valid_tckn(presidio_guardrail):
+    """Test that only checksum-valid TCKNs are masked as TCKN, on both paths."""
+    guardrail = presidio_guardrail
+    for use_presidio in (False, True):
+        assert guardrail.anonymize("Kimlik no 10000000146", use_presidio=use_presidio) == "Kimlik no <TCKN>"
+        assert "<TCKN>" not in guardrail.anonymize("Kimlik no 10000000147", use_presidio=use_presidio)
+
+
+def test_anonymize_masks_multiple_entities_in_one_pass():
+    """Test that the combined scan keeps going after a checksum-rejected candidate."""
+    text = "Ref 4111 1111 1111 1112, card 4111 1111 1111 1111, mail john.doe@example.com, id 10000000146"
+    assert get_guardrail().anonymize(text) == (
+        "Ref 4111 1111 1111 1112, card <CREDIT_CARD>, mail <EMAIL_ADDRESS>, id <TCKN>"
+    )
+
+
+@pytest.mark.parametrize("text", ["", "   ", "hello", "no numbers or mail here, just words."])
+def test_anonymize_skips_texts_without_pii_hints(text):
+    """Test that texts without digits, '@' or ':' are returned as-is."""
+    assert get_guardrail().anonymize(text) is text
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("", False),
+    ("hello, where is my order?", False),
+    ("order 12345", True),
+    ("mail me at a@b.co", True),
+    ("host dead:beef::cafe", True),
+])
+def test_may_contain_pii(text, expected):
+    """Test the precheck used to skip masking for texts without PII hints."""
+    assert may_contain_pii(text) is expected
+
+
+def test_anonymize_masks_ipv6_without_digits():
+    """Test that the prefilter still lets digit-free IPv6 addresses through."""
+    assert "<IP_ADDRESS>" in get_guardrail().anonymize("host dead:beef::cafe up")
+
+
+def test_fast_only_mode_skips_presidio(monkeypatch):
+    """Test that PII_FAST_ONLY never builds the analyzer and serves use_presidio from the fast path."""
+    monkeypatch.setattr(settings, "PII_FAST_ONLY", True)
+    guardrail = PIIGuardrail()
+    assert guardrail.analyzer is None
+    assert guardrail.anonymize("Mail me at john.doe@example.com", use_presidio=True) == "Mail me at <EMAIL_ADDRESS>"
+
+
+def test_anonymize_caches_only_short_texts():
+    """Test that repeated short texts hit the memo and long texts bypass it."""
+    guardrail = PIIGuardrail()
+    short_text = "Call me at +1 415-555-2671"
+    assert guardrail.anonymize(short_text) == guardrail.anonymize(short_text)
+    assert guardrail._anonymize_cached.cache_info().hits == 1
+    
+    long_text = short_text + " x" * settings.PII_CACHE_MAX_TEXT_LENGTH
+    assert guardrail.anonymize(long_text).startswith("Call me at <PHONE_NUMBER>")
+    assert guardrail._anonymize_cached.cache_info().currsize == 1
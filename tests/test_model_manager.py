@@ -0,0 +1,177 @@
+"""Unit tests for the model manager helpers."""
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+import pytest
+import torch
+from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+from app.core.config import get_settings
+from app.services import model_manager as model_manager_module
+from app.services.model_manager import detect_language, model_manager
+
+settings = get_settings()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Kartımı kaybettim, lütfen yardım edin", "tr"),
+    ("Hesap bakiyem ne kadar", "tr"),
+    ("I lost my card, please help me", "en"),
+    ("How do I transfer money to Gökhan?", "en"),
+    ("", "en"),
+])
+def test_detect_language(text, expected):
+    """Test the tr/en decision on typical support messages."""
+    assert detect_language(text) == expected
+
+
+class FakeEncoding(dict):
+    """Tokenizer output stand-in supporting .to(device)."""
+    
+    def to(self, device):
+        return self
+
+
+class FakeTokenizer:
+    """Encodes each text as its length so the fake model can tell rows apart."""
+    
+    def __call__(self, texts, **kwargs):
+        return FakeEncoding(input_ids=torch.tensor([[len(text)] for text in texts]))
+
+
+class FakeModel:
+    """Three-class model whose winning class is the text length modulo 3."""
+    
+    config = SimpleNamespace(id2label={0: "zero", 1: "one", 2: "two"}, num_labels=3)
+    
+    def __init__(self):
+        self.batch_sizes = []
+    
+    def to(self, device):
+        return self
+    
+    def eval(self):
+        return self
+    
+    def __call__(self, input_ids):
+        self.batch_sizes.append(len(input_ids))
+        logits = torch.nn.functional.one_hot(input_ids[:, 0] % 3, num_classes=3).float() * 5
+        return {"logits": logits}
+
+
+@pytest.fixture
+def fake_models(monkeypatch):
+    """Swap the singleton's tokenizer and model for fakes."""
+    fake_model = FakeModel()
+    monkeypatch.setattr(model_manager, "english_tokenizer", FakeTokenizer())
+    monkeypatch.setattr(model_manager, "english_model", fake_model)
+    monkeypatch.setattr(model_manager, "_id2label", ["zero", "one", "two"])
+    return fake_model
+
+
+def test_predict_english_batch_keeps_input_order(fake_models):
+    """Test that a batched forward pass returns one result per text, in order."""
+    results = model_manager._predict_english_batch(["aaa", "a", "aa"], top_k=2)
+    assert [result["intent"] for result in results] == ["zero", "one", "two"]
+    assert all(len(result["predictions"]) == 2 for result in results)
+    assert fake_models.batch_sizes == [3]
+
+
+def test_predict_english_coalesces_concurrent_calls(fake_models, monkeypatch):
+    """Test that concurrent predictions are answered from shared forward passes."""
+    monkeypatch.setattr(settings, "INFERENCE_BATCH_MAX_SIZE", 8)
+    monkeypatch.setattr(settings, "INFERENCE_BATCH_MAX_WAIT_MS", 50.0)
+    texts = ["a" * length for length in range(1, 9)]
+    
+    with ThreadPoolExecutor(max_workers=len(texts)) as executor:
+        results = list(executor.map(lambda text: model_manager._predict_english(text, "en", 1), texts))
+    
+    expected = [FakeModel.config.id2label[len(text) % 3] for text in texts]
+    assert [result["intent"] for result in results] == expected
+    assert all(len(result["predictions"]) == 1 for result in results)
+    assert sum(fake_models.batch_sizes) == len(texts)
+    assert len(fake_models.batch_sizes) < len(texts)
+
+
+def test_predict_english_batch_scores_are_softmax_probabilities(fake_models):
+    """Test that top-k scores equal the full softmax probabilities."""
+    result = model_manager._predict_english_batch(["a"], top_k=3)[0]
+    expected = torch.softmax(torch.tensor([0.0, 5.0, 0.0]), dim=-1).tolist()
+    assert [prediction["score"] for prediction in result["predictions"]] == pytest.approx(
+        sorted(expected, reverse=True)
+    )
+    assert result["confidence"] == pytest.approx(expected[1])
+
+
+def test_load_models_loads_once_under_concurrency(monkeypatch):
+    """Test that concurrent load_models calls load the model a single time."""
+    load_calls = []
+    
+    def fake_from_pretrained(name, **kwargs):
+        load_calls.append(name)
+        time.sleep(0.05)  # Widen the race window
+        return FakeModel()
+    
+    monkeypatch.setattr(model_manager, "english_model", None)
+    monkeypatch.setattr(model_manager, "english_tokenizer", None)
+    monkeypatch.setattr(model_manager, "_id2label", [])
+    monkeypatch.setattr(model_manager, "translator_model", None)
+    monkeypatch.setattr(model_manager, "translator_tokenizer", None)
+    monkeypatch.setattr(model_manager_module.AutoTokenizer, "from_pretrained", lambda name, **kwargs: FakeTokenizer())
+    monkeypatch.setattr(model_manager_module.AutoModelForSequenceClassification, "from_pretrained", fake_from_pretrained)
+    monkeypatch.setattr(model_manager, "_load_translator", lambda: None)
+    
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for future in [executor.submit(model_manager.load_models) for _ in range(4)]:
+            future.result()
+    
+    assert load_calls == [settings.ENGLISH_MODEL]
+    assert isinstance(model_manager.english_model, FakeModel)
+    assert model_manager._id2label == ["zero", "one", "two"]
+
+
+@pytest.mark.parametrize("batch_max_size", [1, 8])
+def test_predict_async_matches_predict(fake_models, monkeypatch, batch_max_size):
+    """Test that the awaitable pipeline returns the same result as the sync one."""
+    monkeypatch.setattr(settings, "INFERENCE_BATCH_MAX_SIZE", batch_max_size)
+    text = "I lost my card"
+    
+    async_result = asyncio.run(model_manager.predict_async(text))
+    assert async_result == model_manager.predict(text)
+    assert async_result.language == "en"
+    assert async_result.translated_text is None
+
+
+def test_traced_model_matches_eager_model(monkeypatch, tmp_path):
+    """Test that the fixed-length traced model scores short texts like the eager model."""
+    vocab_file = tmp_path / "vocab.txt"
+    vocab_file.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "i", "lost", "my", "card"]))
+    tokenizer = BertTokenizerFast(vocab_file=str(vocab_file))
+    torch.manual_seed(0)
+    model = BertForSequenceClassification(BertConfig(
+        vocab_size=8, hidden_size=16, num_hidden_layers=1, num_attention_heads=2,
+        intermediate_size=32, num_labels=4
+    )).eval()
+    
+    monkeypatch.setattr(settings, "TRACE_SEQ_LEN", 16)
+    monkeypatch.setattr(model_manager, "english_tokenizer", tokenizer)
+    monkeypatch.setattr(model_manager, "english_model", model)
+    monkeypatch.setattr(model_manager, "english_model_traced", None)
+    monkeypatch.setattr(model_manager, "_id2label", [f"label_{i}" for i in range(4)])
+    eager_result = model_manager._predict_english_batch(["i lost my card"], top_k=4)[0]
+    
+    monkeypatch.setattr(model_manager, "english_model_traced", model_manager._trace_model(model, tokenizer, 16))
+    traced_result = model_manager._predict_english_batch(["i lost my card"], top_k=4)[0]
+    
+    assert [p["label"] for p in traced_result["predictions"]] == [p["label"] for p in eager_result["predictions"]]
+    assert [p["score"] for p in traced_result["predictions"]] == pytest.approx(
+        [p["score"] for p in eager_result["predictions"]], abs=1e-5
+    )
+
+
+def test_predict_english_batch_top1(fake_models):
+    """Test that top_k=1 returns the argmax with its softmax probability."""
+    result = model_manager._predict_english_batch(["aa"], top_k=1)[0]
+    assert result["intent"] == "two"
+    assert result["predictions"] == [{"label": "two", "score": pytest.approx(result["confidence"])}]
+    assert result["confidence"] == pytest.approx(torch.softmax(torch.tensor([0.0, 0.0, 5.0]), dim=-1)[2].item())
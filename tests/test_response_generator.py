@@ -0,0 +1,88 @@
+"""Unit tests for the response generator."""
+import ast
+import inspect
+from collections import Counter
+import pytest
+from app.services import response_generator
+from app.services.response_generator import (
+    GENERIC_RESPONSES,
+    RESPONSE_MAP,
+    _share_identical_responses,
+    generate_response
+)
+
+
+@pytest.mark.parametrize("intent", [
+    "lost_or_stolen_card",
+    "Lost_Or_Stolen_Card",
+    "lost or stolen card",
+    "lost-or-stolen-card",
+    " lost_or_stolen_card ",
+])
+def test_generate_response_normalizes_intent(intent):
+    """Test that label variations resolve to the same mapped response."""
+    assert generate_response(intent, "en") == RESPONSE_MAP["lost_or_stolen_card"][1]
+    assert generate_response(intent, "tr") == RESPONSE_MAP["lost_or_stolen_card"][0]
+
+
+def test_generate_response_unknown_language_uses_english():
+    """Test that an unsupported language falls back to the English response."""
+    assert generate_response("change_pin", "de") == RESPONSE_MAP["change_pin"][1]
+
+
+@pytest.mark.parametrize("language", ["tr", "en"])
+def test_generate_response_unknown_intent_uses_generic(language):
+    """Test that unknown intents get a generic response in the requested language."""
+    assert generate_response("not_a_banking77_label", language) in GENERIC_RESPONSES[language]
+
+
+def test_response_map_literal_has_no_duplicate_keys():
+    """Test that no RESPONSE_MAP key is silently overwritten by a later duplicate."""
+    module = ast.parse(inspect.getsource(response_generator))
+    response_map = next(
+        node.value for node in module.body
+        if isinstance(node, ast.Assign) and node.targets[0].id == "RESPONSE_MAP"
+    )
+    key_counts = Counter(key.value for key in response_map.keys)
+    assert [key for key, count in key_counts.items() if count > 1] == []
+    assert len(RESPONSE_MAP) == len(response_map.keys)
+
+
+def test_identical_responses_share_one_tuple():
+    """Test that labels with identical responses end up pointing at the same response tuple."""
+    response_map = _share_identical_responses({
+        "label_a": ("Ayni yanit", "Same answer"),
+        "label_b": ("Ayni yanit", "Same answer"),
+        "label_c": ("Baska yanit", "Other answer"),
+    })
+    assert response_map["label_a"] is response_map["label_b"]
+    assert response_map["label_a"] is not response_map["label_c"]
+
+
+def test_unknown_intent_is_not_memoized_to_one_generic_response():
+    """Test that the generic fallback is still picked per call, outside the lookup cache."""
+    responses = {generate_response("not_a_banking77_label", "en") for _ in range(200)}
+    assert len(responses) > 1
+
+
+@pytest.mark.parametrize("language", ["tr", "en", "de"])
+def test_exact_label_dispatch_matches_lookup(language):
+    """Test that the exact-label tables agree with the normalized lookup for every label."""
+    for intent in RESPONSE_MAP:
+        assert generate_response(intent, language) == response_generator._lookup_response(intent, language)
+
+
+def test_generic_responses_rotate():
+    """Test that consecutive fallbacks cycle through every generic response."""
+    responses = [generate_response("not_a_banking77_label", "tr") for _ in GENERIC_RESPONSES["tr"]]
+    assert sorted(responses) == sorted(GENERIC_RESPONSES["tr"])
+
+
+@pytest.mark.parametrize("intent, key", [
+    ("balance_not_updated_after_bank_transfer", "balance_not_updated_after_bank_transfer"),
+    ("wrong_exchange_rate_for_cash_withdrawal", "wrong_exchange_rate_for_cash_withdrawal"),
+    ("reverted_card_payment?", "reverted_card_payment"),
+])
+def test_generate_response_covers_formerly_partial_matched_labels(intent, key):
+    """Test that Banking77 labels once resolved by partial matching keep a topical response."""
+    assert generate_response(intent, "en") == RESPONSE_MAP[key][1]
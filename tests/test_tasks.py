@@ -0,0 +1,184 @@
+"""Unit tests for the Celery ticket processing task."""
+import sqlite3
+import time
+from unittest.mock import MagicMock
+import pytest
+from celery.exceptions import Retry
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.config import get_settings
+from app.core.db import Base
+from app.models.sql_models import Ticket
+from app.services.model_manager import PredictionResult
+from app.worker import tasks
+
+settings = get_settings()
+
+MOCK_PREDICTION = {
+    "intent": "change_pin",
+    "confidence": 0.9,
+    "language": "en",
+    "translated_text": None,
+    "predictions": [{"label": "change_pin", "score": 0.9}]
+}
+
+
+def process_and_persist(text: str) -> dict:
+    """Run the classification task eagerly, then its linked persist task."""
+    result = tasks.process_ticket_task.apply(args=[text]).get()
+    tasks.persist_ticket_task.apply(args=[result]).get()
+    return result
+
+
+@pytest.fixture
+def task_db(monkeypatch):
+    """Point the task session at an in-memory database and stub out prediction and Redis."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session = scoped_session(sessionmaker(bind=engine, autoflush=False))
+    monkeypatch.setattr(tasks, "TaskSession", session)
+    
+    increment_counters = MagicMock()
+    monkeypatch.setattr(tasks.model_manager, "predict", lambda text: PredictionResult(**MOCK_PREDICTION))
+    monkeypatch.setattr(tasks, "increment_ticket_counters", increment_counters)
+    yield session, increment_counters
+    
+    tasks._flush_pending_tickets()
+    session.remove()
+
+
+def test_tickets_are_inserted_in_one_batch(task_db, monkeypatch):
+    """Test that tickets are buffered until the batch size is reached."""
+    session, increment_counters = task_db
+    monkeypatch.setattr(settings, "TICKET_INSERT_BATCH_SIZE", 3)
+    monkeypatch.setattr(settings, "TICKET_INSERT_FLUSH_INTERVAL_MS", 60_000)
+    
+    for i in range(2):
+        process_and_persist(f"mail me at user{i}@example.com")
+    assert session().query(Ticket).count() == 0
+    
+    result = process_and_persist("mail me at user2@example.com")
+    assert session().query(Ticket).count() == 3
+    increment_counters.assert_called_once_with(3, 3)
+    assert result["sanitized_text"] == "mail me at <EMAIL_ADDRESS>"
+
+
+def test_buffered_tickets_are_flushed_by_timer(task_db, monkeypatch):
+    """Test that a partially filled buffer is written after the flush interval."""
+    session, _ = task_db
+    monkeypatch.setattr(settings, "TICKET_INSERT_BATCH_SIZE", 50)
+    monkeypatch.setattr(settings, "TICKET_INSERT_FLUSH_INTERVAL_MS", 50)
+    
+    process_and_persist("I lost my card")
+    time.sleep(0.3)
+    assert session().query(Ticket).count() == 1
+
+
+def test_permanent_errors_are_not_retried(task_db, monkeypatch):
+    """Test that non-transient errors fail the task without scheduling a retry."""
+    retry = MagicMock()
+    monkeypatch.setattr(tasks.model_manager, "predict", MagicMock(side_effect=ValueError("bad input")))
+    monkeypatch.setattr(tasks.process_ticket_task, "retry", retry)
+    
+    with pytest.raises(ValueError):
+        tasks.process_ticket_task.apply(args=["I lost my card"], throw=True)
+    retry.assert_not_called()
+
+
+def test_classification_does_not_write_to_db(task_db, monkeypatch):
+    """Test that process_ticket_task leaves persistence to the linked persist_ticket_task."""
+    session, _ = task_db
+    monkeypatch.setattr(settings, "TICKET_INSERT_BATCH_SIZE", 1)
+    
+    result = tasks.process_ticket_task.apply(args=["I lost my card"]).get()
+    assert session().query(Ticket).count() == 0
+    
+    tasks.persist_ticket_task.apply(args=[result]).get()
+    ticket = session().query(Ticket).one()
+    assert (ticket.intent, ticket.response_text) == ("change_pin", result["response_text"])
+
+
+def ticket_row(**overrides) -> dict:
+    """Column values for one buffered Ticket row."""
+    row = {
+        "text": "I lost my card",
+        "sanitized_text": "I lost my card",
+        "intent": "change_pin",
+        "confidence": 0.9,
+        "language": "en",
+        "response_text": "We can help with that.",
+        "translated_text": None,
+        "prediction_details": "[]"
+    }
+    row.update(overrides)
+    return row
+
+
+def test_failed_flush_re_enqueues_rows(task_db, monkeypatch):
+    """Test that a failed batch INSERT hands its rows back to the broker instead of dropping them."""
+    session, increment_counters = task_db
+    enqueue = MagicMock()
+    monkeypatch.setattr(tasks.save_tickets_task, "apply_async", enqueue)
+    monkeypatch.setattr(settings, "TICKET_INSERT_BATCH_SIZE", 2)
+    Ticket.__table__.drop(session().get_bind())
+    
+    process_and_persist("I lost my card")
+    process_and_persist("I want to change my PIN")
+    
+    rows = enqueue.call_args.kwargs["args"][0]
+    assert [row["text"] for row in rows] == ["I lost my card", "I want to change my PIN"]
+    increment_counters.assert_not_called()
+
+
+def test_save_tickets_task_inserts_rows(task_db):
+    """Test that re-enqueued rows are inserted and counted."""
+    session, increment_counters = task_db
+    
+    tasks.save_tickets_task.apply(args=[[ticket_row(), ticket_row(confidence=0.2)]]).get()
+    
+    assert session().query(Ticket).count() == 2
+    increment_counters.assert_called_once_with(2, 1)
+
+
+def test_save_tickets_task_splits_batch_on_permanent_error(task_db, monkeypatch):
+    """Test that a batch with a bad row is retried row by row so the good rows survive."""
+    session, _ = task_db
+    enqueue = MagicMock()
+    monkeypatch.setattr(tasks.save_tickets_task, "apply_async", enqueue)
+    rows = [ticket_row(), ticket_row(intent=None)]
+    
+    tasks.save_tickets_task.apply(args=[rows], throw=True)
+    
+    assert session().query(Ticket).count() == 0
+    assert [call.kwargs["args"] for call in enqueue.call_args_list] == [[[rows[0]]], [[rows[1]]]]
+
+
+def test_locked_database_is_retried(tmp_path, monkeypatch):
+    """Test that save_tickets_task retries when another connection holds the SQLite write lock."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'locked.db'}", connect_args={"timeout": 0})
+    Base.metadata.create_all(engine)
+    session = scoped_session(sessionmaker(bind=engine, autoflush=False))
+    monkeypatch.setattr(tasks, "TaskSession", session)
+    retry = MagicMock(side_effect=Retry())
+    monkeypatch.setattr(tasks.save_tickets_task, "retry", retry)
+    
+    lock_holder = sqlite3.connect(tmp_path / "locked.db")
+    lock_holder.execute("BEGIN IMMEDIATE")
+    try:
+        with pytest.raises(Retry):
+            tasks.save_tickets_task.apply(args=[[ticket_row()]], throw=True)
+    finally:
+        lock_holder.rollback()
+        lock_holder.close()
+        session.remove()
+        engine.dispose()
+    
+    retry.assert_called_once()
+    assert isinstance(retry.call_args.kwargs["exc"], OperationalError)
+    assert "database is locked" in str(retry.call_args.kwargs["exc"])